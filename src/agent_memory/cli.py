@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import heapq
 import json
+import re
 import sys
 from pathlib import Path
 from typing import Any
@@ -28,6 +30,40 @@ from agent_memory.utils import (
 
 console = Console()
 
+# Substrings in tool output that trigger the `hook check-error` nudge
+ERROR_KEYWORDS = (
+    "Error", "ERROR", "error:",
+    "FAILED", "FAIL",
+    "fatal:", "Fatal:",
+    "panic:",
+    "Traceback",
+    "Exception", "exception:",
+    "ECONNREFUSED", "ENOENT", "EACCES", "EPERM",
+    "segfault", "Segmentation fault",
+    "ModuleNotFoundError",
+    "ImportError",
+    "SyntaxError",
+    "TypeError",
+    "ValueError",
+    "KeyError",
+    "AttributeError",
+    "RuntimeError",
+    "FileNotFoundError",
+    "PermissionError",
+    "ConnectionError",
+    "TimeoutError",
+    "command not found",
+    "No such file or directory",
+)
+
+# All keywords in one alternation, so output is scanned in a single pass
+_ERROR_PATTERN = re.compile("|".join(map(re.escape, ERROR_KEYWORDS)))
+
+
+def has_error_output(text: str) -> bool:
+    """Return True if text contains any of the ERROR_KEYWORDS."""
+    return _ERROR_PATTERN.search(text) is not None
+
 
 def _record_access_for_memories(store: MemoryStore, memories: list[Memory]) -> None:
     """Record access for memories, grouped by scope. Never raises."""
@@ -1264,34 +1300,7 @@ def hook_check_error(ctx: click.Context) -> None:
     if not output_text:
         return
 
-    # Scan for error indicators
-    error_keywords = [
-        "Error", "ERROR", "error:",
-        "FAILED", "FAIL",
-        "fatal:", "Fatal:",
-        "panic:",
-        "Traceback",
-        "Exception", "exception:",
-        "ECONNREFUSED", "ENOENT", "EACCES", "EPERM",
-        "segfault", "Segmentation fault",
-        "ModuleNotFoundError",
-        "ImportError",
-        "SyntaxError",
-        "TypeError",
-        "ValueError",
-        "KeyError",
-        "AttributeError",
-        "RuntimeError",
-        "FileNotFoundError",
-        "PermissionError",
-        "ConnectionError",
-        "TimeoutError",
-        "command not found",
-        "No such file or directory",
-    ]
-
-    found = any(kw in output_text for kw in error_keywords)
-    if not found:
+    if not has_error_output(output_text):
         return
 
     # Emit nudge
@@ -2522,12 +2531,6 @@ def usage(ctx: click.Context, since: str, as_json: bool) -> None:
         console.print("[red]--since must end with 'd' (e.g., 30d)[/red]")
         sys.exit(1)
 
-    from datetime import timedelta
-
-    from agent_memory.utils import get_timestamp
-
-    now = get_timestamp()
-
     # 1. Command frequency
     command_counts = event_log.get_command_counts(since_days)
 
@@ -2548,18 +2551,12 @@ def usage(ctx: click.Context, since: str, as_json: bool) -> None:
     with get_store(config, project_path) as store:
         for check_scope in ["project", "global"]:
             try:
-                memories = store.list(scope=check_scope, limit=100000)
-                total_memories += len(memories)
-                never_accessed += sum(1 for m in memories if m.access_count == 0)
-                old_never_accessed += sum(
-                    1
-                    for m in memories
-                    if m.access_count == 0
-                    and (now - m.created_at) >= timedelta(days=90)
-                    and not m.pinned
-                )
+                total, never, stale = store.access_stats(check_scope, stale_days=90)
             except Exception:
                 continue
+            total_memories += total
+            never_accessed += never
+            old_never_accessed += stale
 
         # Get most accessed across scopes
         for check_scope in ["project", "global"]:
@@ -2567,8 +2564,7 @@ def usage(ctx: click.Context, since: str, as_json: bool) -> None:
                 most_accessed.extend(store.get_most_accessed(check_scope, 5))
             except Exception:
                 continue
-        most_accessed.sort(key=lambda m: m.access_count, reverse=True)
-        most_accessed = most_accessed[:5]
+        most_accessed = heapq.nlargest(5, most_accessed, key=lambda m: m.access_count)
 
         # Get pin candidates
         for check_scope in ["project", "global"]:
@@ -2576,8 +2572,7 @@ def usage(ctx: click.Context, since: str, as_json: bool) -> None:
                 pin_candidates.extend(store.get_pin_candidates(check_scope, 5, 5))
             except Exception:
                 continue
-        pin_candidates.sort(key=lambda m: m.access_count, reverse=True)
-        pin_candidates = pin_candidates[:5]
+        pin_candidates = heapq.nlargest(5, pin_candidates, key=lambda m: m.access_count)
 
     # 5. Build recommendations
     recommendations: list[dict[str, str]] = []
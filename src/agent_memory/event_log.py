@@ -303,8 +303,47 @@ class EventLog:
         except Exception:
             return []
 
+    def usage_bundle(
+        self,
+        since_days: int = 30,
+        recent_limit: int = 50,
+        top_limit: int = 20,
+    ) -> dict[str, Any]:
+        """Run every usage report query inside one read transaction.
+
+        Returns dict with: command_counts, search_stats, session_stats,
+        recent_searches, top_queries. Never raises.
+        """
+        conn: sqlite3.Connection | None
+        try:
+            conn = self._get_conn()
+            if not conn.in_transaction:
+                conn.execute("BEGIN DEFERRED")
+        except Exception:
+            conn = None
+
+        try:
+            return {
+                "command_counts": self.get_command_counts(since_days),
+                "search_stats": self.get_search_stats(since_days),
+                "session_stats": self.get_session_stats(since_days),
+                "recent_searches": self.get_recent_searches(since_days, limit=recent_limit),
+                "top_queries": self.get_top_queries(since_days, limit=top_limit),
+            }
+        finally:
+            if conn is not None and conn.in_transaction:
+                conn.commit()
+
     def close(self) -> None:
         """Close the database connection."""
         if self._conn:
             self._conn.close()
             self._conn = None
+
+    def __enter__(self) -> EventLog:
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Context manager exit."""
+        self.close()
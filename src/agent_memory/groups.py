@@ -12,6 +12,9 @@ import yaml
 from agent_memory.config import Config
 from agent_memory.utils import get_timestamp
 
+# Parsed groups.yaml contents keyed by path, with the (mtime_ns, size) they were read at
+_parsed_groups_files: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+
 
 @dataclass
 class WorkspaceGroup:
@@ -59,18 +62,28 @@ class GroupManager:
         if self._groups is not None:
             return self._groups
 
-        if not self.groups_file.exists():
+        try:
+            stat = self.groups_file.stat()
+        except FileNotFoundError:
             self._groups = {}
             return self._groups
 
         try:
-            with open(self.groups_file) as f:
-                data = yaml.safe_load(f) or {}
+            # Reuse the parsed YAML while the file is unchanged, so polling
+            # the web UI does not re-parse it on every request
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = _parsed_groups_files.get(self.groups_file)
+            if cached is not None and cached[0] == version:
+                data = cached[1]
+            else:
+                with open(self.groups_file) as f:
+                    data = yaml.safe_load(f) or {}
+                _parsed_groups_files[self.groups_file] = (version, data)
 
             self._groups = {}
             for name, group_data in data.get("groups", {}).items():
-                group_data["name"] = name
-                self._groups[name] = WorkspaceGroup.from_dict(group_data)
+                # Copy, since data may be the shared cached parse
+                self._groups[name] = WorkspaceGroup.from_dict({**group_data, "name": name})
         except Exception:
             self._groups = {}
 
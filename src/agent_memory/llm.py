@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import json as _json
 from typing import TYPE_CHECKING
 
+import orjson
+
 if TYPE_CHECKING:
     from agent_memory.config import Config
 
@@ -161,11 +162,11 @@ class LLMProvider:
                 text = text[:-3]
             text = text.strip()
 
-            parsed = _json.loads(text)
+            parsed = orjson.loads(text)
             if isinstance(parsed, list):
                 return parsed
             return []
-        except (_json.JSONDecodeError, ValueError):
+        except orjson.JSONDecodeError:
             return []
 
 
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
@@ -19,6 +24,34 @@ from agent_memory.utils import (
     serialize_metadata,
 )
 
+# Memory-map up to 256 MiB of each database file for faster reads
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Maximum threads used to query project databases in parallel
+MAX_PROJECT_WORKERS = 16
+
+# Which database ("project" or "global") each recently fetched memory id was
+# found in, keyed by (base_path, project_path, memory_id). Shared across
+# store instances so back-to-back web requests for one memory skip a miss.
+# Least recently fetched ids are evicted first.
+SCOPE_HINT_CACHE_SIZE = 1024
+_scope_hints: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_scope_hints_lock = threading.Lock()
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_INSERT_MEMORY_SQL = """
+    INSERT INTO memories
+    (id, content, category, scope, project_path, pinned,
+     created_at, updated_at, expires_at, source, metadata, groups)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class InvalidOperationError(ValueError):
+    """A store operation was rejected by its arguments or the memory's current state."""
+
 
 @dataclass
 class Memory:
@@ -91,6 +124,86 @@ class Memory:
         )
 
 
+def _memory_insert_params(memory: Memory) -> tuple[Any, ...]:
+    """Parameters for _INSERT_MEMORY_SQL from a new Memory."""
+    return (
+        memory.id,
+        memory.content,
+        memory.category,
+        memory.scope,
+        memory.project_path,
+        int(memory.pinned),
+        memory.created_at.isoformat(),
+        memory.updated_at.isoformat(),
+        memory.expires_at.isoformat() if memory.expires_at else None,
+        memory.source,
+        serialize_metadata(memory.metadata),
+        serialize_metadata(memory.groups),
+    )
+
+
+# Case-insensitive substring match on content, shared by every keyword search.
+# unicode_lower is str.lower registered on each connection: SQLite's LOWER()
+# only folds ASCII. Bind the term with _like_contains(term.lower()).
+_CONTENT_CONTAINS_SQL = "unicode_lower(content) LIKE ? ESCAPE '\\'"
+
+
+def _add_sql_functions(conn: sqlite3.Connection) -> None:
+    """Register the Python functions keyword searches use on a connection."""
+    conn.create_function("unicode_lower", 1, str.lower, deterministic=True)
+
+
+def _like_contains(term: str) -> str:
+    """LIKE pattern (with ESCAPE '\\') matching values that contain term."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _drop_expired(memories: list[Memory]) -> list[Memory]:
+    """Filter out expired memories, reading the clock once for the batch."""
+    now = get_timestamp()
+    return [m for m in memories if not is_expired(m.expires_at, now)]
+
+
+def _db_version(conn: sqlite3.Connection, params: list[Any]) -> tuple[Any, ...]:
+    """Change counter and next expiry of one database, for version_token."""
+    try:
+        row: tuple[Any, ...] = conn.execute(
+            "SELECT (SELECT version FROM memories_version WHERE id = 0),"
+            " (SELECT MIN(expires_at) FROM memories WHERE expires_at >= ?)",
+            params,
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Project DB not opened for writing since the counter was added
+        row = conn.execute(
+            "SELECT COUNT(*), MAX(updated_at), MAX(last_accessed_at),"
+            " COALESCE(SUM(access_count), 0),"
+            " COALESCE(SUM(expires_at IS NULL OR expires_at >= ?), 0)"
+            " FROM memories",
+            params,
+        ).fetchone()
+    return row
+
+
+def _map_project_dbs(
+    fetch: Callable[[Path], list[Memory]],
+    project_dbs: list[tuple[Path, Path]],
+) -> Iterator[tuple[Path, list[Memory]]]:
+    """Run fetch on each project DB in a thread pool, yielding results in order.
+
+    Each call opens its own read-only connection, and sqlite releases
+    the GIL while a query runs, so per-project queries overlap.
+    """
+    if not project_dbs:
+        return
+
+    workers = min(MAX_PROJECT_WORKERS, len(project_dbs))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(fetch, [db_path for _, db_path in project_dbs])
+        for (original_path, _), memories in zip(project_dbs, results):
+            yield original_path, memories
+
+
 class MemoryStore:
     """SQLite-based memory store."""
 
@@ -128,7 +241,7 @@ class MemoryStore:
 
     def _get_project_conn(self) -> sqlite3.Connection:
         """Get or create project database connection."""
-        if self.project_db_path is None:
+        if self.project_path is None:
             raise ValueError("No project path set")
         if self._project_conn is None:
             self._project_conn = sqlite3.connect(str(self.project_db_path))
@@ -144,8 +257,23 @@ class MemoryStore:
             return self._get_global_conn()
         return self._get_project_conn()
 
+    @staticmethod
+    def _connect_readonly(db_path: Path) -> sqlite3.Connection:
+        """Open a read-only connection to another project's database."""
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        _add_sql_functions(conn)
+        return conn
+
     def _init_db(self, conn: sqlite3.Connection) -> None:
         """Initialize database schema."""
+        # WAL lets readers (e.g. web UI polls) run alongside a writer
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+
+        _add_sql_functions(conn)
+
         conn.execute("""
             CREATE TABLE IF NOT EXISTS memories (
                 id TEXT PRIMARY KEY,
@@ -185,9 +313,32 @@ class MemoryStore:
         conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_memories_access ON memories(access_count)
         """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_memories_expires ON memories(expires_at)
+        """)
+
+        self._init_version_counter(conn)
 
         conn.commit()
 
+    def _init_version_counter(self, conn: sqlite3.Connection) -> None:
+        """Create the single-row change counter bumped by every memories write."""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memories_version (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                version INTEGER NOT NULL
+            )
+        """)
+        conn.execute("INSERT OR IGNORE INTO memories_version (id, version) VALUES (0, 0)")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS memories_version_{event.lower()}
+                AFTER {event} ON memories
+                BEGIN
+                    UPDATE memories_version SET version = version + 1 WHERE id = 0;
+                END
+            """)
+
     def _migrate_groups_column(self, conn: sqlite3.Connection) -> None:
         """Migrate from shared_groups to groups column and update scopes."""
         # Check if old shared_groups column exists
@@ -291,54 +442,65 @@ class MemoryStore:
         Returns:
             The created Memory object
         """
-        memory_id = generate_memory_id()
+        memory = self._new_memory(
+            content, category, scope, pinned, source, metadata, expires_at, groups
+        )
+        conn = self._get_conn("global" if scope in ("group", "global") else "project")
+        conn.execute(_INSERT_MEMORY_SQL, _memory_insert_params(memory))
+        conn.commit()
+        return memory
+
+    def save_many(self, records: list[dict[str, Any]]) -> list[Memory]:
+        """Save several new memories, one transaction per database.
+
+        Args:
+            records: Keyword arguments for save(), one dict per memory
+
+        Returns:
+            The created Memory objects, in input order
+        """
+        memories = [self._new_memory(**record) for record in records]
+        by_scope: dict[str, list[Memory]] = {}
+        for memory in memories:
+            db_scope = "global" if memory.scope in ("group", "global") else "project"
+            by_scope.setdefault(db_scope, []).append(memory)
+
+        for db_scope, scoped in by_scope.items():
+            conn = self._get_conn(db_scope)
+            with conn:
+                conn.executemany(_INSERT_MEMORY_SQL, map(_memory_insert_params, scoped))
+        return memories
+
+    def _new_memory(
+        self,
+        content: str,
+        category: str | None = None,
+        scope: str = "project",
+        pinned: bool = False,
+        source: str = "user_explicit",
+        metadata: dict[str, Any] | None = None,
+        expires_at: datetime | None = None,
+        groups: list[str] | None = None,
+    ) -> Memory:
+        """Validate save() arguments and build the Memory to insert."""
         now = get_timestamp()
         category = normalize_category(category, content)
         groups = groups or []
 
         # Validate scope
         if scope not in ("project", "group", "global"):
-            raise ValueError(f"Invalid scope: {scope}. Must be 'project', 'group', or 'global'")
+            raise InvalidOperationError(f"Invalid scope: {scope}. Must be 'project', 'group', or 'global'")
 
         # Group scope requires groups
         if scope == "group" and not groups:
-            raise ValueError("Group scope requires at least one group")
-
-        project_path_str = str(self.project_path) if self.project_path else None
-
-        # Group and global scopes use global DB
-        db_scope = "global" if scope in ("group", "global") else "project"
-        conn = self._get_conn(db_scope)
-        conn.execute(
-            """
-            INSERT INTO memories 
-            (id, content, category, scope, project_path, pinned, 
-             created_at, updated_at, expires_at, source, metadata, groups)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                memory_id,
-                content,
-                category,
-                scope,
-                project_path_str,
-                int(pinned),
-                now.isoformat(),
-                now.isoformat(),
-                expires_at.isoformat() if expires_at else None,
-                source,
-                serialize_metadata(metadata),
-                serialize_metadata(groups),
-            ),
-        )
-        conn.commit()
+            raise InvalidOperationError("Group scope requires at least one group")
 
         return Memory(
-            id=memory_id,
+            id=generate_memory_id(),
             content=content,
             category=category,
             scope=scope,
-            project_path=project_path_str,
+            project_path=str(self.project_path) if self.project_path else None,
             pinned=pinned,
             groups=groups,
             created_at=now,
@@ -361,14 +523,45 @@ class MemoryStore:
         return Memory.from_row(row)
 
     def get_by_id(self, memory_id: str) -> Memory | None:
-        """Get a memory by ID, searching both project and global."""
-        # Try project first
-        if self.project_path is not None:
-            memory = self.get(memory_id, "project")
+        """Get a memory by ID, searching both project and global.
+
+        The database a memory was last found in is remembered across store
+        instances and tried first. A stale hint costs one extra lookup.
+        """
+        for scope in self._lookup_scopes(memory_id):
+            memory = self.get(memory_id, scope)
             if memory:
+                self._remember_scope(memory_id, scope)
                 return memory
-        # Try global
-        return self.get(memory_id, "global")
+
+        self._forget_scope(memory_id)
+        return None
+
+    def _scope_hint_key(self, memory_id: str) -> tuple[str, str, str]:
+        """Key for a memory id in the shared scope hint cache."""
+        return (str(self.config.base_path), str(self.project_path), memory_id)
+
+    def _lookup_scopes(self, memory_id: str) -> list[str]:
+        """Scopes to search for a memory id, the last known location first."""
+        if self.project_path is None:
+            return ["global"]
+        if _scope_hints.get(self._scope_hint_key(memory_id)) == "global":
+            return ["global", "project"]
+        return ["project", "global"]
+
+    def _remember_scope(self, memory_id: str, scope: str) -> None:
+        """Record the scope a memory id was found in, evicting the least recent."""
+        key = self._scope_hint_key(memory_id)
+        with _scope_hints_lock:
+            _scope_hints[key] = scope
+            _scope_hints.move_to_end(key)
+            if len(_scope_hints) > SCOPE_HINT_CACHE_SIZE:
+                _scope_hints.popitem(last=False)
+
+    def _forget_scope(self, memory_id: str) -> None:
+        """Drop the recorded scope for a memory id that was not found."""
+        with _scope_hints_lock:
+            _scope_hints.pop(self._scope_hint_key(memory_id), None)
 
     def list(
         self,
@@ -403,7 +596,7 @@ class MemoryStore:
         memories = [Memory.from_row(row) for row in cursor.fetchall()]
 
         if not include_expired:
-            memories = [m for m in memories if not is_expired(m.expires_at)]
+            memories = _drop_expired(memories)
 
         return memories
 
@@ -418,6 +611,7 @@ class MemoryStore:
         category: str | None = None,
         limit: int = 50,
         include_expired: bool = False,
+        query_terms: Sequence[str] | None = None,
     ) -> list[Memory]:
         """List group-scoped memories, optionally filtered by owner group name.
 
@@ -428,6 +622,8 @@ class MemoryStore:
             category: Filter by category.
             limit: Maximum number of results.
             include_expired: Include expired memories.
+            query_terms: Only return memories whose content contains every term
+                        (case-insensitive).
 
         Returns:
             List of group-scoped memories.
@@ -442,6 +638,19 @@ class MemoryStore:
             query += " AND category = ?"
             params.append(category)
 
+        # Filter by group name if specified (groups is a JSON list column)
+        if group_name and group_name.lower() != "all":
+            query += (
+                " AND EXISTS (SELECT 1 FROM json_each("
+                "CASE WHEN json_valid(groups) THEN groups ELSE '[]' END"
+                ") WHERE value = ?)"
+            )
+            params.append(group_name)
+
+        for term in query_terms or []:
+            query += f" AND {_CONTENT_CONTAINS_SQL}"
+            params.append(_like_contains(term.lower()))
+
         if pinned_only:
             query += " AND pinned = 1"
 
@@ -451,12 +660,8 @@ class MemoryStore:
         cursor = conn.execute(query, params)
         memories = [Memory.from_row(row) for row in cursor.fetchall()]
 
-        # Filter by group name if specified (groups is a list field)
-        if group_name and group_name.lower() != "all":
-            memories = [m for m in memories if group_name in m.groups]
-
         if not include_expired:
-            memories = [m for m in memories if not is_expired(m.expires_at)]
+            memories = _drop_expired(memories)
 
         return memories
 
@@ -488,8 +693,8 @@ class MemoryStore:
             terms = group.split()
             and_conditions = []
             for term in terms:
-                and_conditions.append("LOWER(content) LIKE ?")
-                params.append(f"%{term.lower()}%")
+                and_conditions.append(_CONTENT_CONTAINS_SQL)
+                params.append(_like_contains(term.lower()))
             or_clauses.append(f"({' AND '.join(and_conditions)})")
 
         where_clause = " OR ".join(or_clauses)
@@ -499,7 +704,7 @@ class MemoryStore:
             params,
         )
         memories = [Memory.from_row(row) for row in cursor.fetchall()]
-        return [m for m in memories if not is_expired(m.expires_at)]
+        return _drop_expired(memories)
 
     def search_with_groups(
         self,
@@ -524,9 +729,11 @@ class MemoryStore:
         results: list[Memory] = []
         seen_ids: set[str] = set()
 
+        now = get_timestamp()
+
         def add_unique(memories: list[Memory]) -> None:
             for m in memories:
-                if m.id not in seen_ids and not is_expired(m.expires_at):
+                if m.id not in seen_ids and not is_expired(m.expires_at, now):
                     results.append(m)
                     seen_ids.add(m.id)
 
@@ -540,13 +747,8 @@ class MemoryStore:
 
         # Search group scope
         if include_groups:
-            group_memories = self.list_by_group(limit=limit * 2)
-            # Filter by query (case-insensitive, multi-term)
-            query_terms = query.lower().split()
-            matching = [
-                m for m in group_memories
-                if all(term in m.content.lower() for term in query_terms)
-            ]
+            # Filter by query (case-insensitive, multi-term) in SQL
+            matching = self.list_by_group(limit=limit * 2, query_terms=query.split())
 
             # Filter by group names if not "all"
             if "all" not in [g.lower() for g in include_groups]:
@@ -568,8 +770,7 @@ class MemoryStore:
         metadata: dict[str, Any] | None = None,
     ) -> Memory | None:
         """Update a memory."""
-        memory = self.get(memory_id, scope)
-        if memory is None:
+        if not HAS_RETURNING and self.get(memory_id, scope) is None:
             return None
 
         conn = self._get_conn(scope)
@@ -596,10 +797,14 @@ class MemoryStore:
 
         params.append(memory_id)
 
-        conn.execute(
-            f"UPDATE memories SET {', '.join(updates)} WHERE id = ?",
-            params,
-        )
+        query = f"UPDATE memories SET {', '.join(updates)} WHERE id = ?"
+        if HAS_RETURNING:
+            # Update and read back the row in a single statement
+            row = conn.execute(query + " RETURNING *", params).fetchone()
+            conn.commit()
+            return Memory.from_row(row) if row else None
+
+        conn.execute(query, params)
         conn.commit()
 
         return self.get(memory_id, scope)
@@ -612,6 +817,25 @@ class MemoryStore:
         """Unpin a memory."""
         return self.update(memory_id, scope, pinned=False)
 
+    def pin_by_id(self, memory_id: str, pinned: bool = True) -> Memory | None:
+        """Pin or unpin a memory in whichever database holds it.
+
+        Args:
+            memory_id: ID of the memory
+            pinned: New pinned state
+
+        Returns:
+            Updated memory or None if not found
+        """
+        for scope in self._lookup_scopes(memory_id):
+            memory = self.update(memory_id, scope, pinned=pinned)
+            if memory:
+                self._remember_scope(memory_id, scope)
+                return memory
+
+        self._forget_scope(memory_id)
+        return None
+
     def add_groups(
         self,
         memory_id: str,
@@ -631,7 +855,7 @@ class MemoryStore:
             return None
 
         if memory.scope != "group":
-            raise ValueError("Can only add groups to group-scoped memories")
+            raise InvalidOperationError("Can only add groups to group-scoped memories")
 
         # Merge with existing groups
         current_groups = set(memory.groups)
@@ -668,12 +892,12 @@ class MemoryStore:
             return None
 
         if memory.scope != "group":
-            raise ValueError("Can only remove groups from group-scoped memories")
+            raise InvalidOperationError("Can only remove groups from group-scoped memories")
 
         new_groups = [g for g in memory.groups if g not in group_names]
 
         if not new_groups:
-            raise ValueError(
+            raise InvalidOperationError(
                 "Cannot remove all groups from a group-scoped memory. Use set_scope to change to global."
             )
 
@@ -707,10 +931,10 @@ class MemoryStore:
             return None
 
         if memory.scope != "group":
-            raise ValueError("Can only set groups on group-scoped memories")
+            raise InvalidOperationError("Can only set groups on group-scoped memories")
 
         if not group_names:
-            raise ValueError(
+            raise InvalidOperationError(
                 "Cannot set empty groups on group-scoped memory. Use set_scope to change to global."
             )
 
@@ -746,10 +970,10 @@ class MemoryStore:
             return None
 
         if new_scope not in ("project", "group", "global"):
-            raise ValueError(f"Invalid scope: {new_scope}")
+            raise InvalidOperationError(f"Invalid scope: {new_scope}")
 
         if new_scope == "group" and not groups:
-            raise ValueError("Group scope requires at least one group")
+            raise InvalidOperationError("Group scope requires at least one group")
 
         # Determine source and target databases
         old_db = "global" if memory.scope in ("group", "global") else "project"
@@ -848,7 +1072,7 @@ class MemoryStore:
             return None
 
         if memory.scope not in ("global", "group"):
-            raise ValueError("Can only unpromote global or group-scoped memories")
+            raise InvalidOperationError("Can only unpromote global or group-scoped memories")
 
         # Create store for target project
         target_store = MemoryStore(self.config, to_project)
@@ -900,8 +1124,8 @@ class MemoryStore:
         conditions = []
         params: list[Any] = []
         for term in terms:
-            conditions.append("LOWER(content) LIKE ?")
-            params.append(f"%{term.lower()}%")
+            conditions.append(_CONTENT_CONTAINS_SQL)
+            params.append(_like_contains(term.lower()))
         where_clause = " AND ".join(conditions)
         cursor = conn.execute(
             f"DELETE FROM memories WHERE {where_clause}",
@@ -984,6 +1208,84 @@ class MemoryStore:
         cursor = conn.execute(query, params)
         return [Memory.from_row(row) for row in cursor.fetchall()]
 
+    def access_stats(self, scope: str = "project", stale_days: int = 90) -> tuple[int, int, int]:
+        """Count unexpired memories and how many have never been accessed.
+
+        Args:
+            scope: Scope to count
+            stale_days: Age after which an unpinned, never-accessed memory is stale
+
+        Returns:
+            (total, never_accessed, stale) counts from a single query
+        """
+        now = get_timestamp()
+        query = """
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(COALESCE(access_count, 0) = 0), 0),
+                COALESCE(SUM(COALESCE(access_count, 0) = 0 AND pinned = 0 AND created_at <= ?), 0)
+            FROM memories
+            WHERE (expires_at IS NULL OR expires_at >= ?)
+        """
+        params: list[Any] = [(now - timedelta(days=stale_days)).isoformat(), now.isoformat()]
+        if scope in ("group", "global"):
+            query += " AND scope = ?"
+            params.append(scope)
+
+        total, never_accessed, stale = self._get_conn(scope).execute(query, params).fetchone()
+        return total, never_accessed, stale
+
+    def usage_snapshot(
+        self,
+        scopes: tuple[str, ...] = ("project", "global"),
+        most_accessed_limit: int = 5,
+        pin_min_access: int = 5,
+        pin_limit: int = 5,
+    ) -> dict[str, Any]:
+        """Collect usage totals, most-accessed memories and pin candidates.
+
+        The queries for each scope run inside a single read transaction.
+        The project scope is skipped when no project path is set, and a
+        scope whose database cannot be read is left out. Never raises.
+
+        Args:
+            scopes: Scopes to include
+            most_accessed_limit: Maximum most-accessed memories per scope
+            pin_min_access: Minimum access_count for pin candidates
+            pin_limit: Maximum pin candidates per scope
+
+        Returns:
+            Dict with "totals" mapping scope to (total, never_accessed) counts of
+            unexpired memories, plus "most_accessed" and "pin_candidates" lists
+            concatenated across scopes (not merged or re-sorted).
+        """
+        snapshot: dict[str, Any] = {"totals": {}, "most_accessed": [], "pin_candidates": []}
+
+        for scope in scopes:
+            if scope == "project" and self.project_path is None:
+                continue
+
+            try:
+                conn = self._get_conn(scope)
+                began = not conn.in_transaction
+                if began:
+                    conn.execute("BEGIN DEFERRED")
+                try:
+                    total, never_accessed, _ = self.access_stats(scope)
+                    most_accessed = self.get_most_accessed(scope, most_accessed_limit)
+                    pin_candidates = self.get_pin_candidates(scope, pin_min_access, pin_limit)
+                finally:
+                    if began and conn.in_transaction:
+                        conn.commit()
+            except Exception:
+                continue
+
+            snapshot["totals"][scope] = (total, never_accessed)
+            snapshot["most_accessed"].extend(most_accessed)
+            snapshot["pin_candidates"].extend(pin_candidates)
+
+        return snapshot
+
     def count(self, scope: str = "project") -> int:
         """Count memories in scope."""
         conn = self._get_conn(scope)
@@ -1170,32 +1472,62 @@ class MemoryStore:
                 results.append((None, global_memories))
 
         # Scan all project directories
-        if self.config.projects_path.exists():
-            for project_dir in sorted(self.config.projects_path.iterdir()):
-                if not project_dir.is_dir():
-                    continue
+        for original_path, memories in _map_project_dbs(
+            lambda db_path: self._query_db_file(
+                db_path,
+                category=category,
+                pinned_only=pinned_only,
+                limit=limit_per_project,
+            ),
+            list(self._iter_project_dbs()),
+        ):
+            if memories:
+                results.append((original_path, memories))
 
-                db_path = project_dir / "memories.db"
-                if not db_path.exists():
-                    continue
+        return results
 
-                # Resolve original project path
-                ref_file = project_dir / ".project_path"
-                if ref_file.exists():
-                    original_path = Path(ref_file.read_text().strip())
-                else:
-                    original_path = project_dir
-
-                memories = self._query_db_file(
-                    db_path,
-                    category=category,
-                    pinned_only=pinned_only,
-                    limit=limit_per_project,
-                )
-                if memories:
-                    results.append((original_path, memories))
+    def iter_all_projects(
+        self,
+        query: str | None = None,
+        category: str | None = None,
+        pinned_only: bool = False,
+        limit_per_project: int = 50,
+        project_paths: set[str] | None = None,
+    ) -> Iterator[tuple[Path, Memory]]:
+        """
+        Yield memories from every project database, one project at a time.
 
-        return results
+        This is for USER visibility across projects, not for agents.
+        Global memories are not included.
+
+        Args:
+            query: Keyword search query (category and pinned_only are ignored when set)
+            category: Filter by category
+            pinned_only: Only return pinned memories
+            limit_per_project: Max memories per project
+            project_paths: Only read projects whose path is in this set
+
+        Yields:
+            (project_path, memory) tuples
+        """
+        def fetch(db_path: Path) -> list[Memory]:
+            if query:
+                return self._search_db_file(db_path, query=query, limit=limit_per_project)
+            return self._query_db_file(
+                db_path,
+                category=category,
+                pinned_only=pinned_only,
+                limit=limit_per_project,
+            )
+
+        project_dbs = [
+            (original_path, db_path)
+            for original_path, db_path in self._iter_project_dbs()
+            if project_paths is None or str(original_path) in project_paths
+        ]
+        for original_path, memories in _map_project_dbs(fetch, project_dbs):
+            for memory in memories:
+                yield original_path, memory
 
     def search_all_projects(
         self,
@@ -1231,29 +1563,16 @@ class MemoryStore:
                 results.append((None, global_memories))
 
         # Scan all project directories
-        if self.config.projects_path.exists():
-            for project_dir in sorted(self.config.projects_path.iterdir()):
-                if not project_dir.is_dir():
-                    continue
-
-                db_path = project_dir / "memories.db"
-                if not db_path.exists():
-                    continue
-
-                # Resolve original project path
-                ref_file = project_dir / ".project_path"
-                if ref_file.exists():
-                    original_path = Path(ref_file.read_text().strip())
-                else:
-                    original_path = project_dir
-
-                memories = self._search_db_file(
-                    db_path,
-                    query=query,
-                    limit=limit_per_project,
-                )
-                if memories:
-                    results.append((original_path, memories))
+        for original_path, memories in _map_project_dbs(
+            lambda db_path: self._search_db_file(
+                db_path,
+                query=query,
+                limit=limit_per_project,
+            ),
+            list(self._iter_project_dbs()),
+        ):
+            if memories:
+                results.append((original_path, memories))
 
         return results
 
@@ -1266,27 +1585,10 @@ class MemoryStore:
         """
         stats: list[dict[str, Any]] = []
 
-        if not self.config.projects_path.exists():
-            return stats
-
-        for project_dir in sorted(self.config.projects_path.iterdir()):
-            if not project_dir.is_dir():
-                continue
-
-            db_path = project_dir / "memories.db"
-            if not db_path.exists():
-                continue
-
-            # Resolve original project path
-            ref_file = project_dir / ".project_path"
-            if ref_file.exists():
-                original_path = Path(ref_file.read_text().strip())
-            else:
-                original_path = project_dir
-
+        for original_path, db_path in self._iter_project_dbs():
             # Get stats from database
             try:
-                conn = sqlite3.connect(str(db_path))
+                conn = self._connect_readonly(db_path)
                 cursor = conn.execute("SELECT COUNT(*) FROM memories")
                 count = cursor.fetchone()[0]
 
@@ -1307,6 +1609,122 @@ class MemoryStore:
 
         return stats
 
+    def category_histogram(self, include_expired: bool = False) -> dict[tuple[str, str], int]:
+        """Count memories by (scope, category) across global and all project DBs.
+
+        Runs one grouped COUNT query per database file instead of loading rows.
+
+        Args:
+            include_expired: Include expired memories in the counts
+
+        Returns:
+            Dict mapping (scope, category) to memory count
+        """
+        conditions: list[str] = []
+        params: list[Any] = []
+        if not include_expired:
+            conditions.append("(expires_at IS NULL OR expires_at >= ?)")
+            params.append(get_timestamp().isoformat())
+
+        def grouped_query(extra: list[str]) -> str:
+            where = " AND ".join(conditions + extra)
+            return (
+                "SELECT scope, category, COUNT(*) FROM memories"
+                + (f" WHERE {where}" if where else "")
+                + " GROUP BY scope, category"
+            )
+
+        histogram: Counter[tuple[str, str]] = Counter()
+
+        def add_rows(rows: list[tuple[str, str, int]]) -> None:
+            histogram.update({(scope, category): count for scope, category, count in rows})
+
+        add_rows(self._get_global_conn().execute(grouped_query([]), params).fetchall())
+
+        # Project DBs may still hold legacy group rows from before the groups
+        # migration; only their project-scoped rows count
+        project_query = grouped_query(["scope = 'project'"])
+        for _original_path, db_path in self._iter_project_dbs():
+            try:
+                conn = self._connect_readonly(db_path)
+                try:
+                    rows = conn.execute(project_query, params).fetchall()
+                finally:
+                    conn.close()
+            except Exception:
+                # Skip projects with corrupted databases
+                continue
+            add_rows(rows)
+
+        return histogram
+
+    def version_token(
+        self,
+        include_global: bool = True,
+        include_projects: bool = True,
+        project_paths: set[str] | None = None,
+    ) -> str:
+        """Return a short token that changes whenever the selected memories change.
+
+        Each database contributes its change counter (bumped by triggers on
+        every write, including access tracking) and its next expiry time, so
+        the token also changes when a memory expires. Both are single-row
+        lookups. Used by the web UI as an ETag for conditional GET requests.
+
+        Args:
+            include_global: Include the global database (global and group scopes)
+            include_projects: Include every stored project database
+            project_paths: Only include projects whose path is in this set
+
+        Returns:
+            Hex digest string
+        """
+        params = [get_timestamp().isoformat()]
+
+        parts = []
+        if include_global:
+            conn = self._get_global_conn()
+            parts.append(f"global:{_db_version(conn, params)!r}")
+
+        if include_projects:
+            for original_path, db_path in self._iter_project_dbs():
+                if project_paths is not None and str(original_path) not in project_paths:
+                    continue
+                try:
+                    conn = self._connect_readonly(db_path)
+                    try:
+                        row = _db_version(conn, params)
+                    finally:
+                        conn.close()
+                except Exception:
+                    # Skip projects with corrupted databases
+                    continue
+                parts.append(f"{original_path}:{row!r}")
+
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+    def _iter_project_dbs(self) -> Iterator[tuple[Path, Path]]:
+        """Yield (original_project_path, db_path) for every stored project with a DB."""
+        if not self.config.projects_path.exists():
+            return
+
+        for project_dir in sorted(self.config.projects_path.iterdir()):
+            if not project_dir.is_dir():
+                continue
+
+            db_path = project_dir / "memories.db"
+            if not db_path.exists():
+                continue
+
+            # Resolve original project path
+            ref_file = project_dir / ".project_path"
+            if ref_file.exists():
+                original_path = Path(ref_file.read_text().strip())
+            else:
+                original_path = project_dir
+
+            yield original_path, db_path
+
     def _query_db_file(
         self,
         db_path: Path,
@@ -1319,7 +1737,7 @@ class MemoryStore:
             return []
 
         try:
-            conn = sqlite3.connect(str(db_path))
+            conn = self._connect_readonly(db_path)
             query = "SELECT * FROM memories WHERE 1=1"
             params: list[Any] = []
 
@@ -1338,7 +1756,7 @@ class MemoryStore:
             conn.close()
 
             # Filter expired
-            return [m for m in memories if not is_expired(m.expires_at)]
+            return _drop_expired(memories)
         except Exception:
             return []
 
@@ -1357,12 +1775,12 @@ class MemoryStore:
             return []
 
         try:
-            conn = sqlite3.connect(str(db_path))
+            conn = self._connect_readonly(db_path)
             conditions = []
             params: list[Any] = []
             for term in terms:
-                conditions.append("LOWER(content) LIKE ?")
-                params.append(f"%{term.lower()}%")
+                conditions.append(_CONTENT_CONTAINS_SQL)
+                params.append(_like_contains(term.lower()))
             where_clause = " AND ".join(conditions)
             params.append(limit)
             cursor = conn.execute(
@@ -1373,6 +1791,6 @@ class MemoryStore:
             conn.close()
 
             # Filter expired
-            return [m for m in memories if not is_expired(m.expires_at)]
+            return _drop_expired(memories)
         except Exception:
             return []
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import json
+import random
 import subprocess
 import time
 from pathlib import Path
 from typing import Any
 
 CHECK_INTERVAL = 86400  # 24 hours in seconds
+CHECK_JITTER = 8640  # +/-10% of CHECK_INTERVAL, spreads out concurrent refreshes
 SUBPROCESS_TIMEOUT = 10  # seconds
 
 
@@ -91,20 +93,23 @@ def check_for_updates(config: Any) -> dict[str, Any] | None:
     """Check if the local agent-memory repo is behind the remote.
 
     Returns {"behind": N, "local": "<sha>", "remote": "<sha>"} or None.
-    Results are cached for 24 hours to avoid repeated network calls.
+    Results are cached for ~24 hours (with +/-10% jitter) to avoid repeated
+    network calls.
     Never raises — returns None on any failure.
     """
     try:
         cache_path = _get_cache_path(config.base_path)
         cached = _read_cache(cache_path)
 
-        # Return cached result if fresh enough
-        if cached and time.time() - cached.get("last_check", 0) < CHECK_INTERVAL:
-            return {
-                "behind": cached.get("behind", 0),
-                "local": cached.get("local_sha", ""),
-                "remote": cached.get("remote_sha", ""),
-            }
+        # Return cached result if fresh enough (older caches only have last_check)
+        if cached:
+            next_check = cached.get("next_check", cached.get("last_check", 0) + CHECK_INTERVAL)
+            if time.time() < next_check:
+                return {
+                    "behind": cached.get("behind", 0),
+                    "local": cached.get("local_sha", ""),
+                    "remote": cached.get("remote_sha", ""),
+                }
 
         repo_path = _find_repo_path()
         if not repo_path:
@@ -127,8 +132,11 @@ def check_for_updates(config: Any) -> dict[str, Any] | None:
             "remote": remote_sha,
         }
 
+        now = time.time()
+        ttl = CHECK_INTERVAL + random.randint(-CHECK_JITTER, CHECK_JITTER)
         _write_cache(cache_path, {
-            "last_check": time.time(),
+            "last_check": now,
+            "next_check": now + ttl,
             "behind": behind,
             "local_sha": local_sha,
             "remote_sha": remote_sha,
@@ -4,20 +4,21 @@ from __future__ import annotations
 
 import hashlib
 import json
-import uuid
-from datetime import datetime, timezone
+import re
+import secrets
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 
 def generate_memory_id() -> str:
     """Generate a unique memory ID."""
-    return f"mem_{uuid.uuid4().hex[:12]}"
+    return f"mem_{secrets.token_hex(6)}"
 
 
 def generate_session_id() -> str:
     """Generate a unique session ID."""
-    return f"sess_{uuid.uuid4().hex[:12]}"
+    return f"sess_{secrets.token_hex(6)}"
 
 
 def get_timestamp() -> datetime:
@@ -40,6 +41,56 @@ def hash_project_path(project_path: Path) -> str:
     return hashlib.sha256(str(project_path.resolve()).encode()).hexdigest()[:16]
 
 
+DECISION_KEYWORDS = (
+    "prefer",
+    "chose",
+    "decided",
+    "rejected",
+    "instead of",
+    "rather than",
+    "don't use",
+    "always use",
+    "never use",
+    "should use",
+    "shouldn't",
+)
+
+TASK_KEYWORDS = (
+    "completed",
+    "implemented",
+    "fixed",
+    "added",
+    "removed",
+    "refactored",
+    "updated",
+    "created",
+    "deployed",
+    "migrated",
+)
+
+SUMMARY_KEYWORDS = (
+    "session",
+    "summary",
+    "discussed",
+    "covered",
+    "worked on",
+    "today we",
+    "in this session",
+)
+
+
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+# Checked in order; the first category with a matching keyword wins.
+_CATEGORY_PATTERNS = (
+    ("decision", _keyword_pattern(DECISION_KEYWORDS)),
+    ("task_history", _keyword_pattern(TASK_KEYWORDS)),
+    ("session_summary", _keyword_pattern(SUMMARY_KEYWORDS)),
+)
+
+
 def detect_category(content: str) -> str:
     """Attempt to auto-detect memory category from content.
 
@@ -50,52 +101,9 @@ def detect_category(content: str) -> str:
     - session_summary: Conversation summaries
     """
     content_lower = content.lower()
-
-    # Decision indicators
-    decision_keywords = [
-        "prefer",
-        "chose",
-        "decided",
-        "rejected",
-        "instead of",
-        "rather than",
-        "don't use",
-        "always use",
-        "never use",
-        "should use",
-        "shouldn't",
-    ]
-    if any(keyword in content_lower for keyword in decision_keywords):
-        return "decision"
-
-    # Task history indicators
-    task_keywords = [
-        "completed",
-        "implemented",
-        "fixed",
-        "added",
-        "removed",
-        "refactored",
-        "updated",
-        "created",
-        "deployed",
-        "migrated",
-    ]
-    if any(keyword in content_lower for keyword in task_keywords):
-        return "task_history"
-
-    # Session summary indicators
-    summary_keywords = [
-        "session",
-        "summary",
-        "discussed",
-        "covered",
-        "worked on",
-        "today we",
-        "in this session",
-    ]
-    if any(keyword in content_lower for keyword in summary_keywords):
-        return "session_summary"
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(content_lower):
+            return category
 
     # Default to factual
     return "factual"
@@ -127,16 +135,19 @@ def get_current_project_path() -> Path:
     return Path.cwd()
 
 
+VALID_CATEGORIES: frozenset[str] = frozenset(
+    {"factual", "decision", "task_history", "session_summary"}
+)
+
+
 def is_valid_category(category: str) -> bool:
     """Check if category is valid."""
-    return category in {"factual", "decision", "task_history", "session_summary"}
+    return category in VALID_CATEGORIES
 
 
 def normalize_category(category: str | None, content: str = "") -> str:
     """Normalize and validate category, auto-detecting if needed."""
-    if category is None or not is_valid_category(category):
-        return detect_category(content)
-    return category
+    return category if category in VALID_CATEGORIES else detect_category(content)
 
 
 CATEGORY_DISPLAY_NAMES = {
@@ -156,13 +167,14 @@ def calculate_expiration(created_at: datetime, days: int | None) -> datetime | N
     """Calculate expiration datetime."""
     if days is None:
         return None
-    from datetime import timedelta
-
     return created_at + timedelta(days=days)
 
 
-def is_expired(expires_at: datetime | None) -> bool:
-    """Check if a memory is expired."""
+def is_expired(expires_at: datetime | None, now: datetime | None = None) -> bool:
+    """Check if a memory is expired.
+
+    Pass now when checking many memories so the clock is read once.
+    """
     if expires_at is None:
         return False
-    return get_timestamp() > expires_at
+    return (now or get_timestamp()) > expires_at
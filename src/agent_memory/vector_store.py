@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
+from types import ModuleType
 from typing import TYPE_CHECKING, Any
 
 import pyarrow as pa
@@ -15,6 +19,14 @@ from agent_memory.config import Config, find_descendant_project_paths, get_proje
 from agent_memory.embeddings.base import EmbeddingProvider, get_embedding_provider
 
 
+@cache
+def _get_lancedb() -> ModuleType:
+    """Import lancedb on first use, since loading it takes seconds."""
+    import lancedb
+
+    return lancedb
+
+
 @dataclass
 class VectorSearchResult:
     """Result from vector similarity search."""
@@ -76,19 +88,17 @@ class VectorStore:
 
         Note: 'group' scope uses the global database, matching SQLite behavior.
         """
-        import lancedb
-
         if scope in ("global", "group"):
             if self._global_db is None:
                 self.global_db_path.mkdir(parents=True, exist_ok=True)
-                self._global_db = lancedb.connect(str(self.global_db_path))
+                self._global_db = _get_lancedb().connect(str(self.global_db_path))
             return self._global_db
         else:
             if self.project_db_path is None:
                 raise ValueError("No project path set")
             if self._project_db is None:
                 self.project_db_path.mkdir(parents=True, exist_ok=True)
-                self._project_db = lancedb.connect(str(self.project_db_path))
+                self._project_db = _get_lancedb().connect(str(self.project_db_path))
             return self._project_db
 
     def _new_schema(self, dimension: int) -> pa.Schema:
@@ -166,8 +176,6 @@ class VectorStore:
         Returns:
             True if successful, False if semantic search is disabled
         """
-        import json
-
         provider = self.embedding_provider
         if provider is None:
             return False
@@ -206,8 +214,6 @@ class VectorStore:
         Returns:
             True if successful, False if semantic search is disabled
         """
-        import json
-
         if not memories:
             return True
 
@@ -262,8 +268,6 @@ class VectorStore:
         Returns:
             List of search results sorted by similarity
         """
-        import json
-
         provider = self.embedding_provider
         if provider is None:
             return []
@@ -301,8 +305,12 @@ class VectorStore:
             if exclude_group_scope:
                 # Exclude group-scoped memories
                 results_df = results_df[results_df["scope"] != "group"]
-            elif include_groups is not None:
-                # Filter to include specific groups
+            elif include_groups is not None and "all" not in {
+                g.lower() for g in include_groups
+            }:
+                # Filter to include specific groups ("all" includes every group)
+                include_set = set(include_groups)
+
                 def matches_groups(row):
                     row_scope = row.get("scope")
                     if row_scope != "group":
@@ -312,9 +320,7 @@ class VectorStore:
                         row_groups = json.loads(row_groups_str) if row_groups_str else []
                     except (json.JSONDecodeError, TypeError):
                         row_groups = []
-                    if "all" in [g.lower() for g in include_groups]:
-                        return True  # Include all groups
-                    return any(g in row_groups for g in include_groups)
+                    return not include_set.isdisjoint(row_groups)
 
                 results_df = results_df[results_df.apply(matches_groups, axis=1)]
 
@@ -380,10 +386,6 @@ class VectorStore:
         Returns:
             Merged results sorted by score
         """
-        import json
-
-        import lancedb
-
         provider = self.embedding_provider
         if provider is None:
             return []
@@ -396,7 +398,7 @@ class VectorStore:
 
         for _orig_path, vector_dir in self._descendant_vector_paths:
             try:
-                db = lancedb.connect(str(vector_dir))
+                db = _get_lancedb().connect(str(vector_dir))
                 if self.TABLE_NAME not in db.table_names():
                     continue
 
@@ -530,12 +532,19 @@ class VectorStore:
             return False
 
     def delete_by_id(self, memory_id: str) -> bool:
-        """Delete a memory from both project and global stores."""
-        deleted = False
-        if self.project_path is not None:
-            deleted = self.delete(memory_id, "project") or deleted
-        deleted = self.delete(memory_id, "global") or deleted
-        return deleted
+        """Delete a memory from both project and global stores.
+
+        The two stores are independent LanceDB databases, so the deletes run
+        concurrently.
+        """
+        if self.project_path is None:
+            return self.delete(memory_id, "global")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.delete, memory_id, scope) for scope in ("project", "global")
+            ]
+            return any([f.result() for f in futures])
 
     def reset(self, scope: str = "project") -> bool:
         """Delete all vectors in scope.
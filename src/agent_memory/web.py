@@ -2,17 +2,79 @@
 
 from __future__ import annotations
 
+import gzip
+import heapq
+import re
+from collections import Counter
+from collections.abc import Callable
+from functools import wraps
 from pathlib import Path
 from typing import Any
 
-from flask import Flask, jsonify, render_template, request
+import orjson
+from flask import Flask, Response, g, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
 
 from agent_memory.config import Config, load_config
 from agent_memory.event_log import EventLog
 from agent_memory.groups import GroupManager
-from agent_memory.store import MemoryStore
+from agent_memory.store import InvalidOperationError, MemoryStore
 from agent_memory.utils import get_current_project_path, truncate_text
 
+# Splits a comma-separated query parameter, dropping whitespace around commas
+_split_commas = re.compile(r"\s*,\s*").split
+
+# Gzip JSON responses of at least this many bytes, at this level
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+
+
+class BadRequestError(Exception):
+    """Invalid client input, reported to the client as a JSON 400."""
+
+
+def _int_arg(name: str, default: int) -> int:
+    """Read an integer query parameter, rejecting malformed values."""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequestError(f"{name} must be an integer") from None
+
+
+def _required_scope(data: dict[str, Any]) -> str:
+    """Read the scope from a JSON body, rejecting a missing or non-string value."""
+    scope = data.get("scope")
+    if not scope or not isinstance(scope, str):
+        raise BadRequestError("scope is required")
+    return scope
+
+
+def _required_groups(data: dict[str, Any]) -> list[str]:
+    """Read a non-empty list of group names from a JSON body."""
+    groups = data.get("groups")
+    if not groups or not isinstance(groups, list) or not all(isinstance(g, str) for g in groups):
+        raise BadRequestError("groups list is required")
+    return groups
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson.
+
+    Keeps Flask's sorted-key output and falls back to Flask's default
+    hook for types orjson does not handle natively.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 
 def create_app(config: Config | None = None, project_path: Path | None = None) -> Flask:
     """Create and configure the Flask app.
@@ -26,15 +88,118 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     if project_path is None:
         project_path = get_current_project_path()
 
+    project_path_str = str(project_path) if project_path else None
+
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     app.config["config"] = config
     app.config["project_path"] = project_path
 
     def get_store() -> MemoryStore:
-        return MemoryStore(config, project_path)
+        """Return the request's MemoryStore, opening it on first use."""
+        if "store" not in g:
+            g.store = MemoryStore(config, project_path)
+        store: MemoryStore = g.store
+        return store
 
     def get_groups() -> GroupManager:
-        return GroupManager(config)
+        """Return the request's GroupManager, loading it on first use."""
+        if "groups" not in g:
+            g.groups = GroupManager(config)
+        groups: GroupManager = g.groups
+        return groups
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        """Gzip JSON responses when the client accepts it."""
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.mimetype != "application/json"
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+
+        # The body depends on Accept-Encoding whether or not this client gets gzip
+        response.vary.add("Accept-Encoding")
+        if "gzip" not in request.accept_encodings:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+
+    @app.errorhandler(BadRequestError)
+    @app.errorhandler(InvalidOperationError)
+    def handle_bad_request(e: Exception) -> tuple[Response, int]:
+        """Report bad input, such as a non-integer limit or an invalid scope, as a 400."""
+        return jsonify({"error": str(e)}), 400
+
+    @app.teardown_appcontext
+    def close_store(exc: BaseException | None) -> None:
+        store = g.pop("store", None)
+        if store is not None:
+            store.close()
+
+    def groups_file_version() -> str:
+        """Validator for groups.yaml: its mtime and size, or "-" if missing."""
+        try:
+            stat = (config.base_path / "groups.yaml").stat()
+        except FileNotFoundError:
+            return "-"
+        return f"{stat.st_mtime_ns}.{stat.st_size}"
+
+    def conditional_get(
+        version: Callable[[], str],
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Serve 304 Not Modified when the client's ETag is still current.
+
+        version returns a token covering only the data the endpoint reads,
+        so repeat polls from the UI skip the queries and JSON encoding.
+        """
+
+        def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+            @wraps(view)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                etag = version()
+                if request.if_none_match.contains_weak(etag):
+                    response = Response(status=304)
+                else:
+                    response = app.make_response(view(*args, **kwargs))
+                if response.status_code in (200, 304):
+                    # Weak, since the body may be gzip-encoded after this
+                    response.set_etag(etag, weak=True)
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def memories_version() -> str:
+        """ETag source for /api/memories: only the databases the scope reads."""
+        scope = request.args.get("scope", "project")
+        if scope == "project":
+            project_filter = request.args.get("projects", "")
+            selected_paths = {p for p in _split_commas(project_filter.strip()) if p}
+            return get_store().version_token(
+                include_global=False, project_paths=selected_paths or None
+            )
+        if scope in ("global", "group"):
+            return get_store().version_token(include_projects=False)
+        # Unknown scopes always list nothing
+        return "none"
+
+    def projects_version() -> str:
+        """ETag source for /api/projects: the project databases."""
+        return get_store().version_token(include_global=False)
+
+    def stats_version() -> str:
+        """ETag source for /api/stats: every database plus groups.yaml."""
+        return f"{get_store().version_token()}-{groups_file_version()}"
 
     # ── HTML ────────────────────────────────────────────────────
 
@@ -45,93 +210,73 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     # ── Memories CRUD ───────────────────────────────────────────
 
     @app.route("/api/memories")
+    @conditional_get(memories_version)
     def list_memories():
         scope = request.args.get("scope", "project")
         category = request.args.get("category") or None
         pinned = request.args.get("pinned")
         q = request.args.get("q")
-        limit = int(request.args.get("limit", "50"))
-
-        with get_store() as store:
-            if scope == "project":
-                # Project scope with optional multi-project filter
-                project_filter = request.args.get("projects", "")
-                selected_paths = [
-                    p.strip() for p in project_filter.split(",") if p.strip()
-                ] if project_filter else None
-
-                if q:
-                    results = store.search_all_projects(q, limit_per_project=limit)
-                else:
-                    results = store.list_all_projects(
-                        category=category,
-                        pinned_only=pinned == "true",
-                        limit_per_project=limit,
-                        include_global=False,
-                    )
-
-                if selected_paths:
-                    # Filter to only selected projects
-                    selected_set = set(selected_paths)
-                    memories = [
-                        m for proj, mems in results
-                        if proj is not None and str(proj) in selected_set
-                        for m in mems
-                    ]
-                else:
-                    # All projects (exclude the global=None entry)
-                    memories = [
-                        m for proj, mems in results
-                        if proj is not None
-                        for m in mems
-                    ]
-            elif scope == "group":
-                group_name = request.args.get("group") or None
-                if q:
-                    group_memories = store.list_by_group(limit=limit * 2)
-                    query_terms = q.lower().split()
-                    memories = [
-                        m for m in group_memories
-                        if all(t in m.content.lower() for t in query_terms)
-                    ]
-                    if group_name:
-                        memories = [m for m in memories if group_name in m.groups]
-                else:
-                    memories = store.list_by_group(
-                        group_name=group_name,
-                        pinned_only=pinned == "true",
-                        category=category,
-                        limit=limit,
-                    )
-            elif scope == "global":
-                if q:
-                    memories = store.search_keyword(q, "global", limit)
-                else:
-                    memories = store.list(
-                        scope="global",
-                        category=category,
-                        pinned_only=pinned == "true",
-                        limit=limit,
-                    )
+        limit = _int_arg("limit", 50)
+
+        store = get_store()
+        if scope == "project":
+            # Project scope with optional multi-project filter
+            project_filter = request.args.get("projects", "")
+            selected_paths = {p for p in _split_commas(project_filter.strip()) if p}
+
+            memories = [
+                m for _, m in store.iter_all_projects(
+                    query=q or None,
+                    category=category,
+                    pinned_only=pinned == "true",
+                    limit_per_project=limit,
+                    project_paths=selected_paths or None,
+                )
+            ]
+        elif scope == "group":
+            group_name = request.args.get("group") or None
+            if q:
+                memories = store.list_by_group(
+                    group_name=group_name,
+                    limit=limit,
+                    query_terms=q.split(),
+                )
+            else:
+                memories = store.list_by_group(
+                    group_name=group_name,
+                    pinned_only=pinned == "true",
+                    category=category,
+                    limit=limit,
+                )
+        elif scope == "global":
+            if q:
+                memories = store.search_keyword(q, "global", limit)
             else:
-                memories = []
+                memories = store.list(
+                    scope="global",
+                    category=category,
+                    pinned_only=pinned == "true",
+                    limit=limit,
+                )
+        else:
+            memories = []
         return jsonify([m.to_dict() for m in memories])
 
     @app.route("/api/memories/search")
     def search_memories():
         q = request.args.get("q", "")
         scope = request.args.get("scope", "project")
-        limit = int(request.args.get("limit", "20"))
+        limit = _int_arg("limit", 20)
         if not q.strip():
             return jsonify([])
-        with get_store() as store:
-            memories = store.search_keyword(q, scope, limit)
+        store = get_store()
+        memories = store.search_keyword(q, scope, limit)
         return jsonify([m.to_dict() for m in memories])
 
     @app.route("/api/memories/<memory_id>")
     def get_memory(memory_id: str):
-        with get_store() as store:
-            memory = store.get_by_id(memory_id)
+        store = get_store()
+        memory = store.get_by_id(memory_id)
         if memory is None:
             return jsonify({"error": "Not found"}), 404
         return jsonify(memory.to_dict())
@@ -146,40 +291,40 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
         scope = data.get("scope", "project")
         groups = data.get("groups") or None
 
-        with get_store() as store:
-            memory = store.save(
-                content=content,
-                category=data.get("category") or None,
-                scope=scope,
-                pinned=data.get("pinned", False),
-                source="web_ui",
-                metadata=data.get("metadata") or None,
-                groups=groups,
-            )
+        store = get_store()
+        memory = store.save(
+            content=content,
+            category=data.get("category") or None,
+            scope=scope,
+            pinned=data.get("pinned", False),
+            source="web_ui",
+            metadata=data.get("metadata") or None,
+            groups=groups,
+        )
         return jsonify(memory.to_dict()), 201
 
     @app.route("/api/memories/<memory_id>", methods=["PUT"])
     def update_memory(memory_id: str):
         data: dict[str, Any] = request.get_json() or {}
-        with get_store() as store:
-            memory = store.get_by_id(memory_id)
-            if memory is None:
-                return jsonify({"error": "Not found"}), 404
-            updated = store.update(
-                memory_id,
-                scope=memory.scope,
-                content=data.get("content"),
-                category=data.get("category"),
-                metadata=data.get("metadata"),
-            )
+        store = get_store()
+        memory = store.get_by_id(memory_id)
+        if memory is None:
+            return jsonify({"error": "Not found"}), 404
+        updated = store.update(
+            memory_id,
+            scope=memory.scope,
+            content=data.get("content"),
+            category=data.get("category"),
+            metadata=data.get("metadata"),
+        )
         if updated is None:
             return jsonify({"error": "Update failed"}), 500
         return jsonify(updated.to_dict())
 
     @app.route("/api/memories/<memory_id>", methods=["DELETE"])
     def delete_memory(memory_id: str):
-        with get_store() as store:
-            deleted = store.delete_by_id(memory_id)
+        store = get_store()
+        deleted = store.delete_by_id(memory_id)
         if not deleted:
             return jsonify({"error": "Not found"}), 404
         return jsonify({"ok": True})
@@ -188,24 +333,18 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
 
     @app.route("/api/memories/<memory_id>/pin", methods=["POST"])
     def pin_memory(memory_id: str):
-        with get_store() as store:
-            memory = store.get_by_id(memory_id)
-            if memory is None:
-                return jsonify({"error": "Not found"}), 404
-            result = store.pin(memory_id, memory.scope)
+        store = get_store()
+        result = store.pin_by_id(memory_id)
         if result is None:
-            return jsonify({"error": "Pin failed"}), 500
+            return jsonify({"error": "Not found"}), 404
         return jsonify(result.to_dict())
 
     @app.route("/api/memories/<memory_id>/unpin", methods=["POST"])
     def unpin_memory(memory_id: str):
-        with get_store() as store:
-            memory = store.get_by_id(memory_id)
-            if memory is None:
-                return jsonify({"error": "Not found"}), 404
-            result = store.unpin(memory_id, memory.scope)
+        store = get_store()
+        result = store.pin_by_id(memory_id, pinned=False)
         if result is None:
-            return jsonify({"error": "Unpin failed"}), 500
+            return jsonify({"error": "Not found"}), 404
         return jsonify(result.to_dict())
 
     # ── Promote / Unpromote ─────────────────────────────────────
@@ -214,8 +353,8 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     def promote_memory(memory_id: str):
         data: dict[str, Any] = request.get_json() or {}
         to_group = data.get("to_group") or None
-        with get_store() as store:
-            result = store.promote(memory_id, to_group=to_group)
+        store = get_store()
+        result = store.promote(memory_id, to_group=to_group)
         if result is None:
             return jsonify({"error": "Not found or not in project scope"}), 404
         return jsonify(result.to_dict())
@@ -223,13 +362,11 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     @app.route("/api/memories/<memory_id>/unpromote", methods=["POST"])
     def unpromote_memory(memory_id: str):
         data: dict[str, Any] = request.get_json() or {}
-        to_project = data.get("to_project")
-        if not to_project:
-            to_project = str(project_path) if project_path else None
+        to_project = data.get("to_project") or project_path_str
         if not to_project:
             return jsonify({"error": "to_project is required"}), 400
-        with get_store() as store:
-            result = store.unpromote(memory_id, Path(to_project))
+        store = get_store()
+        result = store.unpromote(memory_id, Path(to_project))
         if result is None:
             return jsonify({"error": "Not found or not in global/group scope"}), 404
         return jsonify(result.to_dict())
@@ -239,15 +376,10 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     @app.route("/api/memories/<memory_id>/scope", methods=["PUT"])
     def set_memory_scope(memory_id: str):
         data: dict[str, Any] = request.get_json() or {}
-        new_scope = data.get("scope")
+        new_scope = _required_scope(data)
         groups = data.get("groups") or None
-        if not new_scope:
-            return jsonify({"error": "scope is required"}), 400
-        try:
-            with get_store() as store:
-                result = store.set_scope(memory_id, new_scope, groups=groups)
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
+        store = get_store()
+        result = store.set_scope(memory_id, new_scope, groups=groups)
         if result is None:
             return jsonify({"error": "Not found"}), 404
         return jsonify(result.to_dict())
@@ -255,14 +387,9 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     @app.route("/api/memories/<memory_id>/groups", methods=["POST"])
     def add_memory_groups(memory_id: str):
         data: dict[str, Any] = request.get_json() or {}
-        group_names = data.get("groups", [])
-        if not group_names:
-            return jsonify({"error": "groups list is required"}), 400
-        try:
-            with get_store() as store:
-                result = store.add_groups(memory_id, group_names)
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
+        group_names = _required_groups(data)
+        store = get_store()
+        result = store.add_groups(memory_id, group_names)
         if result is None:
             return jsonify({"error": "Not found"}), 404
         return jsonify(result.to_dict())
@@ -270,14 +397,9 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     @app.route("/api/memories/<memory_id>/groups", methods=["DELETE"])
     def remove_memory_groups(memory_id: str):
         data: dict[str, Any] = request.get_json() or {}
-        group_names = data.get("groups", [])
-        if not group_names:
-            return jsonify({"error": "groups list is required"}), 400
-        try:
-            with get_store() as store:
-                result = store.remove_groups(memory_id, group_names)
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
+        group_names = _required_groups(data)
+        store = get_store()
+        result = store.remove_groups(memory_id, group_names)
         if result is None:
             return jsonify({"error": "Not found"}), 404
         return jsonify(result.to_dict())
@@ -285,14 +407,9 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     @app.route("/api/memories/<memory_id>/groups", methods=["PUT"])
     def set_memory_groups(memory_id: str):
         data: dict[str, Any] = request.get_json() or {}
-        group_names = data.get("groups", [])
-        if not group_names:
-            return jsonify({"error": "groups list is required"}), 400
-        try:
-            with get_store() as store:
-                result = store.set_groups(memory_id, group_names)
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
+        group_names = _required_groups(data)
+        store = get_store()
+        result = store.set_groups(memory_id, group_names)
         if result is None:
             return jsonify({"error": "Not found"}), 404
         return jsonify(result.to_dict())
@@ -300,6 +417,7 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     # ── Groups ──────────────────────────────────────────────────
 
     @app.route("/api/groups")
+    @conditional_get(groups_file_version)
     def list_groups():
         gm = get_groups()
         groups = gm.list_groups()
@@ -314,17 +432,18 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
 
         result = group.to_dict()
         # Include group memories
-        with get_store() as store:
-            memories = store.list_by_group(group_name=name, limit=100)
+        store = get_store()
+        memories = store.list_by_group(group_name=name, limit=100)
         result["memories"] = [m.to_dict() for m in memories]
         return jsonify(result)
 
     # ── Projects ────────────────────────────────────────────────
 
     @app.route("/api/projects")
+    @conditional_get(projects_version)
     def list_projects():
-        with get_store() as store:
-            stats = store.get_all_project_stats()
+        store = get_store()
+        stats = store.get_all_project_stats()
         result = []
         for s in stats:
             result.append({
@@ -337,33 +456,22 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     # ── Stats ───────────────────────────────────────────────────
 
     @app.route("/api/stats")
+    @conditional_get(stats_version)
     def get_stats():
-        with get_store() as store:
-            # Per-project stats
-            all_project_stats = store.get_all_project_stats()
-            projects_total = sum(s["memory_count"] for s in all_project_stats)
-
-            # Global (excludes group-scoped)
-            global_memories = store.list("global", limit=10000)
-            global_count = len(global_memories)
-
-            # Group-scoped
-            group_memories = store.list_by_group(limit=10000)
-            group_count = len(group_memories)
-
-            # Category breakdown across all visible scopes
-            categories: dict[str, int] = {}
-            all_results = store.list_all_projects(
-                limit_per_project=10000, include_global=False,
-            )
-            for _, mems in all_results:
-                for m in mems:
-                    if m.scope == "project":
-                        categories[m.category] = categories.get(m.category, 0) + 1
-            for m in global_memories:
-                categories[m.category] = categories.get(m.category, 0) + 1
-            for m in group_memories:
-                categories[m.category] = categories.get(m.category, 0) + 1
+        store = get_store()
+        # Per-project stats
+        all_project_stats = store.get_all_project_stats()
+        projects_total = sum(s["memory_count"] for s in all_project_stats)
+
+        # Counts by (scope, category) in one grouped query per database
+        # and a category breakdown across all visible scopes
+        scope_counts: Counter[str] = Counter()
+        categories: Counter[str] = Counter()
+        for (scope, category), n in store.category_histogram().items():
+            scope_counts[scope] += n
+            categories[category] += n
+        global_count = scope_counts["global"]
+        group_count = scope_counts["group"]
 
         gm = get_groups()
         groups = gm.list_groups()
@@ -385,57 +493,31 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
             "categories": categories,
             "group_names": [g.name for g in groups],
             "project_list": project_list,
-            "current_project": str(project_path) if project_path else None,
+            "current_project": project_path_str,
         })
 
     # ── Usage / Analytics ─────────────────────────────────────────
 
     @app.route("/api/usage")
     def get_usage():
-        since_days = int(request.args.get("since_days", "30"))
-        event_log = EventLog(config)
-
-        try:
-            command_counts = event_log.get_command_counts(since_days)
-            search_stats = event_log.get_search_stats(since_days)
-            session_stats = event_log.get_session_stats(since_days)
-        finally:
-            event_log.close()
+        since_days = _int_arg("since_days", 30)
+        with EventLog(config) as event_log:
+            usage = event_log.usage_bundle(since_days, recent_limit=50, top_limit=20)
+        search_stats = usage["search_stats"]
 
         # Memory effectiveness from store
-        from datetime import timedelta
-        from agent_memory.utils import get_timestamp
-
-        now = get_timestamp()
-        total_memories = 0
-        never_accessed = 0
-        most_accessed = []
-        pin_candidates = []
-
-        with get_store() as store:
-            for check_scope in ["project", "global"]:
-                try:
-                    memories = store.list(scope=check_scope, limit=100000)
-                    total_memories += len(memories)
-                    never_accessed += sum(1 for m in memories if m.access_count == 0)
-                except Exception:
-                    continue
-
-            for check_scope in ["project", "global"]:
-                try:
-                    most_accessed.extend(store.get_most_accessed(check_scope, 5))
-                except Exception:
-                    continue
-            most_accessed.sort(key=lambda m: m.access_count, reverse=True)
-            most_accessed = most_accessed[:5]
-
-            for check_scope in ["project", "global"]:
-                try:
-                    pin_candidates.extend(store.get_pin_candidates(check_scope, 5, 5))
-                except Exception:
-                    continue
-            pin_candidates.sort(key=lambda m: m.access_count, reverse=True)
-            pin_candidates = pin_candidates[:5]
+        snapshot = get_store().usage_snapshot(
+            ("project", "global"), most_accessed_limit=5, pin_min_access=5, pin_limit=5
+        )
+        total_memories = sum(total for total, _ in snapshot["totals"].values())
+        never_accessed = sum(never for _, never in snapshot["totals"].values())
+
+        most_accessed = heapq.nlargest(
+            5, snapshot["most_accessed"], key=lambda m: m.access_count
+        )
+        pin_candidates = heapq.nlargest(
+            5, snapshot["pin_candidates"], key=lambda m: m.access_count
+        )
 
         # Recommendations
         recommendations: list[dict[str, str]] = []
@@ -452,15 +534,11 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
                 "reason": f"{pct}% of searches return 0 results",
             })
 
-        # Search insights
-        recent_searches = event_log.get_recent_searches(since_days, limit=50)
-        top_queries = event_log.get_top_queries(since_days, limit=20)
-
         return jsonify({
             "period_days": since_days,
-            "command_frequency": command_counts,
+            "command_frequency": usage["command_counts"],
             "search_effectiveness": search_stats,
-            "session_compliance": session_stats,
+            "session_compliance": usage["session_stats"],
             "memory_effectiveness": {
                 "total_memories": total_memories,
                 "never_accessed": never_accessed,
@@ -471,8 +549,8 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
                 ],
             },
             "search_insights": {
-                "recent_searches": recent_searches,
-                "top_queries": top_queries,
+                "recent_searches": usage["recent_searches"],
+                "top_queries": usage["top_queries"],
             },
             "recommendations": recommendations,
         })
@@ -483,7 +561,7 @@ def create_app(config: Config | None = None, project_path: Path | None = None) -
     def get_config():
         return jsonify({
             "base_path": str(config.base_path),
-            "current_project": str(project_path) if project_path else None,
+            "current_project": project_path_str,
             "semantic_enabled": config.semantic.enabled,
             "expiration_enabled": config.expiration.enabled,
         })
@@ -7,11 +7,19 @@ from pathlib import Path
 from typing import Generator
 
 import pytest
+from click.testing import CliRunner
 
 from agent_memory.config import Config, load_config
+from agent_memory.event_log import EventLog
 from agent_memory.store import MemoryStore
 
 
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """One CliRunner shared by every CLI test; it keeps no state between invokes."""
+    return CliRunner()
+
+
 @pytest.fixture
 def temp_dir() -> Generator[Path, None, None]:
     """Create a temporary directory for tests."""
@@ -25,20 +33,61 @@ def config(temp_dir: Path) -> Config:
     return load_config(temp_dir)
 
 
-@pytest.fixture
-def store(config: Config, temp_dir: Path) -> Generator[MemoryStore, None, None]:
-    """Create a test memory store."""
-    project_path = temp_dir / "test-project"
-    project_path.mkdir()
+@pytest.fixture(scope="session")
+def project_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create one project directory shared by the whole test session."""
+    return tmp_path_factory.mktemp("test-project")
+
 
-    store = MemoryStore(config, project_path)
+@pytest.fixture(scope="session")
+def shared_store(
+    tmp_path_factory: pytest.TempPathFactory, project_path: Path
+) -> Generator[MemoryStore, None, None]:
+    """Create one project MemoryStore shared by the whole test session."""
+    store = MemoryStore(load_config(tmp_path_factory.mktemp("store")), project_path)
+    # The files only live for this session, so skip fsync on every commit
+    for scope in ("project", "global"):
+        store._get_conn(scope).execute("PRAGMA synchronous=OFF")
     yield store
     store.close()
 
 
-@pytest.fixture
-def global_store(config: Config) -> Generator[MemoryStore, None, None]:
-    """Create a test memory store for global scope."""
-    store = MemoryStore(config, None)
+@pytest.fixture(scope="session")
+def shared_global_store(shared_store: MemoryStore) -> Generator[MemoryStore, None, None]:
+    """Create one global-only MemoryStore on the shared store's base path."""
+    store = MemoryStore(shared_store.config, None)
+    store._get_conn("global").execute("PRAGMA synchronous=OFF")
     yield store
     store.close()
+
+
+@pytest.fixture
+def store(shared_store: MemoryStore) -> Generator[MemoryStore, None, None]:
+    """Provide the shared project store, emptied after each test."""
+    yield shared_store
+    shared_store.reset("project")
+    shared_store.reset("global")
+
+
+@pytest.fixture
+def global_store(shared_global_store: MemoryStore) -> Generator[MemoryStore, None, None]:
+    """Provide the shared global store, emptied after each test."""
+    yield shared_global_store
+    shared_global_store.reset("global")
+
+
+@pytest.fixture(scope="session")
+def shared_event_log(tmp_path_factory: pytest.TempPathFactory) -> Generator[EventLog, None, None]:
+    """Create one EventLog connection shared by the whole test session."""
+    log = EventLog(load_config(tmp_path_factory.mktemp("event-log")))
+    yield log
+    log.close()
+
+
+@pytest.fixture
+def event_log(shared_event_log: EventLog) -> Generator[EventLog, None, None]:
+    """Provide the shared EventLog, emptied after each test."""
+    yield shared_event_log
+    conn = shared_event_log._get_conn()
+    conn.execute("DELETE FROM events")
+    conn.commit()
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import os
 import sqlite3
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -18,101 +22,159 @@ def hierarchy_config(tmp_path: Path) -> Config:
     return load_config(tmp_path)
 
 
-def _create_project(config: Config, project_dir: Path) -> Path:
+@functools.lru_cache(maxsize=4096)
+def _project_hash(resolved: str) -> str:
+    """Storage directory name for a resolved project path (matches get_project_path)."""
+    return hashlib.sha256(os.fsencode(resolved)).hexdigest()[:16]
+
+
+def _create_project(config: Config, project_dir: Path, resolved: Path | None = None) -> Path:
     """Create a project storage directory with a .project_path ref file.
 
+    Pass ``resolved`` when the caller already has ``project_dir.resolve()``.
+    Otherwise ``os.path.abspath`` is used: pytest's tmp_path is already
+    symlink-free, so it matches ``resolve()`` without the lstat() walk.
     Returns the storage path.
     """
-    project_hash = hashlib.sha256(str(project_dir.resolve()).encode()).hexdigest()[:16]
-    storage = config.projects_path / project_hash
-    storage.mkdir(parents=True, exist_ok=True)
-    (storage / ".project_path").write_text(str(project_dir.resolve()))
-    (storage / "summaries").mkdir(exist_ok=True)
+    resolved_str = str(resolved) if resolved is not None else os.path.abspath(project_dir)
+    storage = config.projects_path / _project_hash(resolved_str)
+    os.makedirs(storage, exist_ok=True)
+    (storage / ".project_path").write_text(resolved_str)
     return storage
 
 
-def _save_memory_to_db(storage: Path, memory_id: str, content: str, **kwargs) -> None:
-    """Insert a memory directly into a project's memories.db."""
-    db_path = storage / "memories.db"
+def _mk_parent_child(parent: Path, sub: str) -> tuple[Path, Path]:
+    """Create ``parent / sub`` (and parent with it) in one makedirs call."""
+    child = parent / sub
+    child.mkdir(parents=True, exist_ok=True)
+    return parent, child
+
+
+def _has_dupes(items: Iterable[str]) -> bool:
+    """Return True as soon as any item repeats."""
+    seen: set[str] = set()
+    for item in items:
+        if item in seen:
+            return True
+        seen.add(item)
+    return False
+
+
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS memories (
+        id TEXT PRIMARY KEY,
+        content TEXT NOT NULL,
+        category TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        project_path TEXT,
+        pinned INTEGER DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        expires_at TEXT,
+        source TEXT NOT NULL,
+        metadata TEXT DEFAULT '{}',
+        groups TEXT DEFAULT '[]',
+        access_count INTEGER DEFAULT 0,
+        last_accessed_at TEXT
+    );
+"""
+
+
+# Connections opened by _save_memory_to_db, keyed by database path. The
+# schema is created once when a connection is opened, never per insert.
+_CONN_CACHE: dict[Path, sqlite3.Connection] = {}
+
+
+@pytest.fixture(autouse=True)
+def _close_cached_connections() -> Iterator[None]:
+    """Close connections cached by _save_memory_to_db after each test."""
+    try:
+        yield
+    finally:
+        for conn in _CONN_CACHE.values():
+            conn.close()
+        _CONN_CACHE.clear()
+
+
+def _open_and_init(db_path: Path) -> sqlite3.Connection:
+    """Open a project's memories.db, create the schema and cache the connection.
+
+    The file has to stay on disk for MemoryStore to find it, but tests never
+    need it to survive a crash, so commits skip fsync.
+    """
     conn = sqlite3.connect(str(db_path))
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS memories (
-            id TEXT PRIMARY KEY,
-            content TEXT NOT NULL,
-            category TEXT NOT NULL,
-            scope TEXT NOT NULL,
-            project_path TEXT,
-            pinned INTEGER DEFAULT 0,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            expires_at TEXT,
-            source TEXT NOT NULL,
-            metadata TEXT DEFAULT '{}',
-            groups TEXT DEFAULT '[]',
-            access_count INTEGER DEFAULT 0,
-            last_accessed_at TEXT
-        )
-    """)
-    conn.execute(
-        """
-        INSERT INTO memories (id, content, category, scope, project_path, pinned,
-                              created_at, updated_at, source, metadata, groups)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, '{}', '[]')
-        """,
-        (
-            memory_id,
-            content,
-            kwargs.get("category", "factual"),
-            "project",
-            str(kwargs.get("project_path", "")),
-            int(kwargs.get("pinned", False)),
-            kwargs.get("created_at", "2025-01-15T10:00:00+00:00"),
-            kwargs.get("updated_at", "2025-01-15T10:00:00+00:00"),
-            kwargs.get("source", "user_explicit"),
-        ),
-    )
-    conn.commit()
-    conn.close()
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.executescript(_SCHEMA_SQL)
+    _CONN_CACHE[db_path] = conn
+    return conn
 
 
-class TestFindDescendantProjectPaths:
-    """Tests for find_descendant_project_paths()."""
+def _save_memory_to_db(storage: Path, memory_id: str, content: str, **kwargs) -> None:
+    """Insert a memory directly into a project's memories.db."""
+    _save_memories_to_db(storage, [{"id": memory_id, "content": content, **kwargs}])
 
-    def test_finds_child_projects(self, hierarchy_config: Config, tmp_path: Path) -> None:
-        """Should find projects that are children of the parent."""
-        parent = tmp_path / "workspace" / "studio"
-        child1 = parent / "db-writer"
-        child2 = parent / "api-server"
 
-        # Create storage entries
-        _create_project(hierarchy_config, child1)
-        _create_project(hierarchy_config, child2)
+def _save_memories_to_db(storage: Path, rows: list[dict[str, Any]]) -> None:
+    """Insert several memories into a project's memories.db in one transaction.
 
-        results = find_descendant_project_paths(hierarchy_config, parent)
+    Each row needs "id" and "content"; other columns fall back to defaults.
+    """
+    db_path = storage / "memories.db"
+    conn = _CONN_CACHE.get(db_path) or _open_and_init(db_path)
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO memories (id, content, category, scope, project_path, pinned,
+                                  created_at, updated_at, source, metadata, groups)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, '{}', '[]')
+            """,
+            [
+                (
+                    row["id"],
+                    row["content"],
+                    row.get("category", "factual"),
+                    "project",
+                    str(row.get("project_path", "")),
+                    int(row.get("pinned", False)),
+                    row.get("created_at", "2025-01-15T10:00:00+00:00"),
+                    row.get("updated_at", "2025-01-15T10:00:00+00:00"),
+                    row.get("source", "user_explicit"),
+                )
+                for row in rows
+            ],
+        )
 
-        original_paths = {orig for orig, _storage in results}
-        assert child1.resolve() in original_paths
-        assert child2.resolve() in original_paths
 
-    def test_excludes_parent_itself(self, hierarchy_config: Config, tmp_path: Path) -> None:
-        """Should not include the parent directory itself."""
-        parent = tmp_path / "workspace" / "studio"
-        _create_project(hierarchy_config, parent)
+# (projects created, relative to the parent; which of them are descendants)
+DESCENDANT_SCENARIOS = [
+    pytest.param(["db-writer", "api-server"], {"db-writer", "api-server"}, id="children"),
+    pytest.param(["."], set(), id="excludes-parent-itself"),
+    pytest.param(["../other-project"], set(), id="excludes-non-descendants"),
+    pytest.param(["packages/core/lib"], {"packages/core/lib"}, id="deeply-nested"),
+]
 
-        results = find_descendant_project_paths(hierarchy_config, parent)
-        original_paths = {orig for orig, _storage in results}
-        assert parent.resolve() not in original_paths
 
-    def test_excludes_non_descendants(self, hierarchy_config: Config, tmp_path: Path) -> None:
-        """Should not include projects that aren't descendants."""
-        parent = tmp_path / "workspace" / "studio"
-        sibling = tmp_path / "workspace" / "other-project"
+class TestFindDescendantProjectPaths:
+    """Tests for find_descendant_project_paths()."""
 
-        _create_project(hierarchy_config, sibling)
+    @pytest.mark.parametrize(("projects", "expected"), DESCENDANT_SCENARIOS)
+    def test_descendant_membership(
+        self,
+        hierarchy_config: Config,
+        tmp_path: Path,
+        projects: list[str],
+        expected: set[str],
+    ) -> None:
+        """Should return exactly the stored projects nested under the parent."""
+        parent = tmp_path / "workspace" / "studio"
+        for rel in projects:
+            _create_project(hierarchy_config, parent / rel, (parent / rel).resolve())
 
         results = find_descendant_project_paths(hierarchy_config, parent)
         original_paths = {orig for orig, _storage in results}
-        assert sibling.resolve() not in original_paths
+        assert original_paths == {(parent / rel).resolve() for rel in expected}
 
     def test_shallow_path_safety_guard(self, hierarchy_config: Config) -> None:
         """Should return empty for paths with <= 2 components."""
@@ -140,27 +202,13 @@ class TestFindDescendantProjectPaths:
         results = find_descendant_project_paths(hierarchy_config, parent)
         assert results == []
 
-    def test_finds_deeply_nested(self, hierarchy_config: Config, tmp_path: Path) -> None:
-        """Should find deeply nested descendants."""
-        parent = tmp_path / "workspace" / "studio"
-        deep_child = parent / "packages" / "core" / "lib"
-
-        _create_project(hierarchy_config, deep_child)
-
-        results = find_descendant_project_paths(hierarchy_config, parent)
-        original_paths = {orig for orig, _storage in results}
-        assert deep_child.resolve() in original_paths
-
 
 class TestListWithDescendants:
     """Tests for MemoryStore.list_with_descendants()."""
 
     def test_merges_current_and_descendant(self, hierarchy_config: Config, tmp_path: Path) -> None:
         """Should include memories from both current project and descendants."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "db-writer"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "db-writer")
 
         # Save a memory to the child project
         child_storage = _create_project(hierarchy_config, child)
@@ -179,30 +227,25 @@ class TestListWithDescendants:
 
     def test_deduplicates_by_id(self, hierarchy_config: Config, tmp_path: Path) -> None:
         """Should not return duplicate memory IDs."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         child_storage = _create_project(hierarchy_config, child)
         _save_memory_to_db(child_storage, "mem_dup", "Duplicate test")
 
         parent_store = MemoryStore(hierarchy_config, parent)
         memories = parent_store.list_with_descendants()
-        ids = [m.id for m in memories]
-        assert len(ids) == len(set(ids)), "Found duplicate IDs"
+        assert not _has_dupes(m.id for m in memories), "Found duplicate IDs"
         parent_store.close()
 
     def test_filters_by_category(self, hierarchy_config: Config, tmp_path: Path) -> None:
         """Should respect category filter across descendants."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         child_storage = _create_project(hierarchy_config, child)
-        _save_memory_to_db(child_storage, "mem_fact", "A fact", category="factual")
-        _save_memory_to_db(child_storage, "mem_dec", "A decision", category="decision")
+        _save_memories_to_db(child_storage, [
+            {"id": "mem_fact", "content": "A fact", "category": "factual"},
+            {"id": "mem_dec", "content": "A decision", "category": "decision"},
+        ])
 
         parent_store = MemoryStore(hierarchy_config, parent)
         factual = parent_store.list_with_descendants(category="factual")
@@ -213,14 +256,13 @@ class TestListWithDescendants:
 
     def test_pinned_only(self, hierarchy_config: Config, tmp_path: Path) -> None:
         """Should respect pinned_only filter."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         child_storage = _create_project(hierarchy_config, child)
-        _save_memory_to_db(child_storage, "mem_pin", "Pinned item", pinned=True)
-        _save_memory_to_db(child_storage, "mem_nopin", "Not pinned")
+        _save_memories_to_db(child_storage, [
+            {"id": "mem_pin", "content": "Pinned item", "pinned": True},
+            {"id": "mem_nopin", "content": "Not pinned"},
+        ])
 
         parent_store = MemoryStore(hierarchy_config, parent)
         pinned = parent_store.list_with_descendants(pinned_only=True)
@@ -230,18 +272,13 @@ class TestListWithDescendants:
 
     def test_sorted_by_created_at_desc(self, hierarchy_config: Config, tmp_path: Path) -> None:
         """Should return memories sorted by created_at descending."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         child_storage = _create_project(hierarchy_config, child)
-        _save_memory_to_db(
-            child_storage, "mem_old", "Old memory", created_at="2024-01-01T00:00:00+00:00"
-        )
-        _save_memory_to_db(
-            child_storage, "mem_new", "New memory", created_at="2025-06-01T00:00:00+00:00"
-        )
+        _save_memories_to_db(child_storage, [
+            {"id": "mem_old", "content": "Old memory", "created_at": "2024-01-01T00:00:00+00:00"},
+            {"id": "mem_new", "content": "New memory", "created_at": "2025-06-01T00:00:00+00:00"},
+        ])
 
         parent_store = MemoryStore(hierarchy_config, parent)
         memories = parent_store.list_with_descendants()
@@ -257,14 +294,13 @@ class TestSearchWithDescendants:
         self, hierarchy_config: Config, tmp_path: Path
     ) -> None:
         """Should find matching memories in descendant projects."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "db-writer"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "db-writer")
 
         child_storage = _create_project(hierarchy_config, child)
-        _save_memory_to_db(child_storage, "mem_s1", "Stripe webhook configuration")
-        _save_memory_to_db(child_storage, "mem_s2", "Database migration notes")
+        _save_memories_to_db(child_storage, [
+            {"id": "mem_s1", "content": "Stripe webhook configuration"},
+            {"id": "mem_s2", "content": "Database migration notes"},
+        ])
 
         parent_store = MemoryStore(hierarchy_config, parent)
         results = parent_store.search_with_descendants("Stripe")
@@ -290,18 +326,14 @@ class TestSearchWithDescendants:
         self, hierarchy_config: Config, tmp_path: Path
     ) -> None:
         """Search results should be deduplicated by ID."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         child_storage = _create_project(hierarchy_config, child)
         _save_memory_to_db(child_storage, "mem_unique", "Unique search term xyz123")
 
         parent_store = MemoryStore(hierarchy_config, parent)
         results = parent_store.search_with_descendants("xyz123")
-        ids = [m.id for m in results]
-        assert len(ids) == len(set(ids))
+        assert not _has_dupes(m.id for m in results)
         parent_store.close()
 
 
@@ -312,10 +344,7 @@ class TestSaveTargetsExactDirectory:
         self, hierarchy_config: Config, tmp_path: Path
     ) -> None:
         """Save should only write to the current project's DB, not descendants."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         _create_project(hierarchy_config, child)
 
@@ -342,10 +371,7 @@ class TestExactFlagBehavior:
         self, hierarchy_config: Config, tmp_path: Path
     ) -> None:
         """list(scope='project') should not include descendant memories."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         child_storage = _create_project(hierarchy_config, child)
         _save_memory_to_db(child_storage, "mem_child_only", "Child-only memory")
@@ -365,10 +391,7 @@ class TestExactFlagBehavior:
         self, hierarchy_config: Config, tmp_path: Path
     ) -> None:
         """search_keyword should not include descendant memories."""
-        parent = tmp_path / "workspace" / "studio"
-        parent.mkdir(parents=True, exist_ok=True)
-        child = parent / "sub"
-        child.mkdir(parents=True, exist_ok=True)
+        parent, child = _mk_parent_child(tmp_path / "workspace" / "studio", "sub")
 
         child_storage = _create_project(hierarchy_config, child)
         _save_memory_to_db(child_storage, "mem_child_s", "UniqueSearchTerm42")
@@ -0,0 +1,50 @@
+"""Tests for workspace group management."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import yaml
+
+from agent_memory.config import Config
+from agent_memory.groups import GroupManager, _parsed_groups_files
+
+
+class TestGroupsFileCache:
+    """Tests for reusing the parsed groups.yaml across GroupManagers."""
+
+    def test_rewritten_file_is_reloaded(self, config: Config) -> None:
+        """Test that a new manager sees edits made after the first load."""
+        GroupManager(config).create("team")
+        assert [g.name for g in GroupManager(config).list_groups()] == ["team"]
+
+        # Another writer (e.g. the CLI) rewrites the file after it was cached
+        other = GroupManager(config)
+        other.create("ops")
+        other.add_project("ops", Path("/work/api"))
+
+        reloaded = GroupManager(config)
+        assert [g.name for g in reloaded.list_groups()] == ["team", "ops"]
+        ops = reloaded.get("ops")
+        assert ops is not None
+        assert ops.projects == [Path("/work/api")]
+
+    def test_hand_edited_file_is_reloaded(self, config: Config) -> None:
+        """Test that a direct rewrite of groups.yaml is picked up."""
+        GroupManager(config).create("team")
+        assert GroupManager(config).get("team") is not None
+
+        groups_file = config.base_path / "groups.yaml"
+        data = yaml.safe_load(groups_file.read_text())
+        data["groups"]["renamed-team"] = data["groups"].pop("team")
+        groups_file.write_text(yaml.dump(data) + "\n")
+
+        assert [g.name for g in GroupManager(config).list_groups()] == ["renamed-team"]
+
+    def test_cached_data_is_not_mutated(self, config: Config) -> None:
+        """Test that loading groups leaves the shared parsed data untouched."""
+        GroupManager(config).create("team")
+        GroupManager(config).list_groups()
+
+        _, data = _parsed_groups_files[config.base_path / "groups.yaml"]
+        assert "name" not in data["groups"]["team"]
@@ -3,42 +3,57 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
 
+import pytest
 from click.testing import CliRunner
 
-from agent_memory.cli import main
+from agent_memory.cli import has_error_output, main
+from agent_memory.config import load_config, save_config_data
 
+ERROR_MESSAGES = [
+    "Traceback (most recent call last):",
+    "fatal: not a git repository",
+    "FAILED tests/test_foo.py::test_bar",
+    "ModuleNotFoundError: No module named 'foo'",
+    "panic: runtime error: index out of range",
+    "TypeError: undefined is not a function",
+    "command not found: foobar",
+]
 
-class TestHookCheckError:
-    """Tests for hook check-error subcommand."""
 
-    def test_nudge_when_error_detected(self, config, temp_dir):
-        """Test that a nudge is printed when errors are found in input."""
-        runner = CliRunner()
+@pytest.fixture(scope="class")
+def nudge_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Base path whose config.yaml has hooks.error_nudge enabled, written once per class.
 
-        # Enable error_nudge in config
-        from agent_memory.config import save_config_data
+    check-error only reads the config, so the directory is safe to share.
+    """
+    base_path = tmp_path_factory.mktemp("nudge")
+    load_config(base_path)
+    save_config_data(base_path / "config.yaml", {"hooks": {"error_nudge": True}})
+    return base_path
 
-        config_file = temp_dir / "config.yaml"
-        save_config_data(config_file, {"hooks": {"error_nudge": True}})
 
+class TestHookCheckError:
+    """Tests for hook check-error subcommand."""
+
+    def test_nudge_when_error_detected(self, runner, nudge_dir):
+        """Test that a nudge is printed when errors are found in input."""
         input_data = json.dumps({"tool_response": "Error: ECONNREFUSED 127.0.0.1:6379"})
 
         result = runner.invoke(
             main,
             ["hook", "check-error"],
             input=input_data,
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
+            env={"AGENT_MEMORY_PATH": str(nudge_dir)},
         )
 
         assert result.exit_code == 0
         assert "[agent-memory]" in result.output
         assert "Error detected" in result.output
 
-    def test_silent_when_disabled(self, config, temp_dir):
+    def test_silent_when_disabled(self, runner, config, temp_dir):
         """Test that no output is produced when hooks.error_nudge is disabled."""
-        runner = CliRunner()
-
         # Default config has error_nudge=false
         input_data = json.dumps({"tool_response": "Error: ECONNREFUSED"})
 
@@ -52,110 +67,62 @@ class TestHookCheckError:
         assert result.exit_code == 0
         assert result.output.strip() == ""
 
-    def test_silent_when_no_error(self, config, temp_dir):
+    def test_silent_when_no_error(self, runner, nudge_dir):
         """Test that no output is produced when there are no errors."""
-        runner = CliRunner()
-
-        from agent_memory.config import save_config_data
-
-        config_file = temp_dir / "config.yaml"
-        save_config_data(config_file, {"hooks": {"error_nudge": True}})
-
         input_data = json.dumps({"tool_response": "Build succeeded. 42 tests passed."})
 
         result = runner.invoke(
             main,
             ["hook", "check-error"],
             input=input_data,
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
+            env={"AGENT_MEMORY_PATH": str(nudge_dir)},
         )
 
         assert result.exit_code == 0
         assert result.output.strip() == ""
 
-    def test_silent_on_empty_stdin(self, config, temp_dir):
+    def test_silent_on_empty_stdin(self, runner, nudge_dir):
         """Test graceful handling of empty stdin."""
-        runner = CliRunner()
-
-        from agent_memory.config import save_config_data
-
-        config_file = temp_dir / "config.yaml"
-        save_config_data(config_file, {"hooks": {"error_nudge": True}})
-
         result = runner.invoke(
             main,
             ["hook", "check-error"],
             input="",
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
+            env={"AGENT_MEMORY_PATH": str(nudge_dir)},
         )
 
         assert result.exit_code == 0
         assert result.output.strip() == ""
 
-    def test_detects_various_error_keywords(self, config, temp_dir):
+    @pytest.mark.parametrize("msg", ERROR_MESSAGES)
+    def test_detects_various_error_keywords(self, msg):
         """Test that various error keywords are detected."""
-        runner = CliRunner()
+        assert has_error_output(msg), f"Failed to detect error in: {msg}"
 
-        from agent_memory.config import save_config_data
-
-        config_file = temp_dir / "config.yaml"
-        save_config_data(config_file, {"hooks": {"error_nudge": True}})
-
-        error_messages = [
-            "Traceback (most recent call last):",
-            "fatal: not a git repository",
-            "FAILED tests/test_foo.py::test_bar",
-            "ModuleNotFoundError: No module named 'foo'",
-            "panic: runtime error: index out of range",
-            "TypeError: undefined is not a function",
-            "command not found: foobar",
-        ]
-
-        for msg in error_messages:
-            input_data = json.dumps({"tool_response": msg})
-            result = runner.invoke(
-                main,
-                ["hook", "check-error"],
-                input=input_data,
-                env={"AGENT_MEMORY_PATH": str(temp_dir)},
-            )
-            assert "[agent-memory]" in result.output, f"Failed to detect error in: {msg}"
-
-    def test_handles_non_json_stdin(self, config, temp_dir):
-        """Test handling of raw text (non-JSON) stdin."""
-        runner = CliRunner()
-
-        from agent_memory.config import save_config_data
-
-        config_file = temp_dir / "config.yaml"
-        save_config_data(config_file, {"hooks": {"error_nudge": True}})
+    def test_ignores_clean_output(self):
+        """Test that output without error keywords is not flagged."""
+        assert not has_error_output("3 passed in 0.12s")
 
+    def test_handles_non_json_stdin(self, runner, nudge_dir):
+        """Test handling of raw text (non-JSON) stdin."""
         result = runner.invoke(
             main,
             ["hook", "check-error"],
             input="Error: something went wrong",
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
+            env={"AGENT_MEMORY_PATH": str(nudge_dir)},
         )
 
         assert result.exit_code == 0
         assert "[agent-memory]" in result.output
 
-    def test_handles_stdout_field(self, config, temp_dir):
+    def test_handles_stdout_field(self, runner, nudge_dir):
         """Test extraction from stdout field."""
-        runner = CliRunner()
-
-        from agent_memory.config import save_config_data
-
-        config_file = temp_dir / "config.yaml"
-        save_config_data(config_file, {"hooks": {"error_nudge": True}})
-
         input_data = json.dumps({"stdout": "FileNotFoundError: config.yaml not found"})
 
         result = runner.invoke(
             main,
             ["hook", "check-error"],
             input=input_data,
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
+            env={"AGENT_MEMORY_PATH": str(nudge_dir)},
         )
 
         assert result.exit_code == 0
@@ -183,8 +150,6 @@ class TestHooksConfig:
         assert "hooks.error_nudge" in result.output
 
         # Verify it persisted
-        from agent_memory.config import load_config
-
         new_config = load_config(temp_dir)
         assert new_config.hooks.error_nudge is True
 
@@ -208,7 +173,5 @@ class TestHooksConfig:
 
         assert result.exit_code == 0
 
-        from agent_memory.config import load_config
-
         new_config = load_config(temp_dir)
         assert new_config.hooks.error_nudge is False
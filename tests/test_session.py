@@ -2,65 +2,79 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import subprocess
+import sys
+from collections.abc import Generator
+from datetime import datetime, timezone
+from typing import Any
 
 import pytest
 
-from agent_memory.config import Config
 from agent_memory.session import Session, SessionManager
 from agent_memory.store import MemoryStore
 
 
+@pytest.fixture(scope="session")
+def shared_session_manager(shared_store: MemoryStore) -> SessionManager:
+    """Create one session manager on the shared store."""
+    return SessionManager(shared_store.config, shared_store, None, shared_store.project_path)
+
+
 @pytest.fixture
-def session_manager(config: Config, store: MemoryStore, temp_dir: Path) -> SessionManager:
-    """Create a test session manager."""
-    project_path = temp_dir / "test-project"
-    project_path.mkdir(exist_ok=True)
-    return SessionManager(config, store, None, project_path)
+def session_manager(
+    shared_session_manager: SessionManager, store: MemoryStore
+) -> Generator[SessionManager, None, None]:
+    """Provide the shared session manager, with no sessions left after each test."""
+    yield shared_session_manager
+    shared_session_manager._current_session = None
+    shared_session_manager.sessions_file.unlink(missing_ok=True)
 
 
-class TestSession:
-    """Tests for Session dataclass."""
+STARTED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
-    def test_session_to_dict(self) -> None:
-        """Test Session.to_dict() method."""
-        from datetime import datetime, timezone
-
-        session = Session(
-            id="sess_test123",
-            project_path="/test/path",
-            started_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
-            ended_at=None,
-            summary_count=2,
-            metadata={"key": "value"},
-        )
-
-        data = session.to_dict()
-
-        assert data["id"] == "sess_test123"
-        assert data["project_path"] == "/test/path"
-        assert "2024-01-01" in data["started_at"]
-        assert data["ended_at"] is None
-        assert data["summary_count"] == 2
-        assert data["metadata"] == {"key": "value"}
-
-    def test_session_from_dict(self) -> None:
-        """Test Session.from_dict() method."""
-        data = {
+SESSION_DICTS = [
+    pytest.param(
+        {
             "id": "sess_test123",
             "project_path": "/test/path",
-            "started_at": "2024-01-01T00:00:00+00:00",
+            "started_at": STARTED_AT.isoformat(),
             "ended_at": None,
             "summary_count": 2,
             "metadata": {"key": "value"},
-        }
+        },
+        id="open",
+    ),
+    pytest.param(
+        {
+            "id": "sess_test456",
+            "project_path": "/test/path",
+            "started_at": STARTED_AT.isoformat(),
+            "ended_at": "2024-01-01T01:30:00+00:00",
+            "summary_count": 0,
+            "metadata": {},
+        },
+        id="ended",
+    ),
+]
+
 
+def test_import_does_not_load_lancedb() -> None:
+    """Test that importing the session module leaves lancedb unloaded."""
+    code = "import sys, agent_memory.session; print('lancedb' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout.strip() == "False", result.stderr
+
+
+class TestSession:
+    """Tests for Session dataclass."""
+
+    @pytest.mark.parametrize("data", SESSION_DICTS)
+    def test_session_dict_round_trip(self, data: dict[str, Any]) -> None:
+        """Test Session.from_dict() and Session.to_dict() are inverses."""
         session = Session.from_dict(data)
 
-        assert session.id == "sess_test123"
-        assert session.project_path == "/test/path"
-        assert session.ended_at is None
-        assert session.summary_count == 2
+        assert session.started_at == STARTED_AT
+        assert session.to_dict() == data
 
 
 class TestSessionManager:
@@ -159,13 +173,14 @@ class TestSessionManager:
         assert len(context) == 1
         assert context[0].content == "Important context"
 
-    def test_should_summarize(self, session_manager: SessionManager) -> None:
-        """Test should_summarize logic."""
-        # Default interval is 20
-        assert session_manager.should_summarize(0) is False
-        assert session_manager.should_summarize(10) is False
-        assert session_manager.should_summarize(20) is True
-        assert session_manager.should_summarize(40) is True
+    @pytest.mark.parametrize(
+        ("count", "expected"), [(0, False), (10, False), (20, True), (40, True)]
+    )
+    def test_should_summarize(
+        self, session_manager: SessionManager, count: int, expected: bool
+    ) -> None:
+        """Test should_summarize logic against the default interval of 20."""
+        assert session_manager.should_summarize(count) is expected
 
     def test_session_with_metadata(self, session_manager: SessionManager) -> None:
         """Test starting session with metadata."""
@@ -3,21 +3,65 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
 
-from click.testing import CliRunner
+import click
+import pytest
 
-from agent_memory.cli import main
+from agent_memory.cli import main, session_analyze
+from agent_memory.config import load_config
+from agent_memory.event_log import EventLog
 from agent_memory.llm import LLMProvider
 
 
+@pytest.fixture(scope="module")
+def cli_env(tmp_path_factory: pytest.TempPathFactory) -> dict[str, str]:
+    """Environment pointing the CLI at one base path for the module."""
+    return {"AGENT_MEMORY_PATH": str(tmp_path_factory.mktemp("analyze"))}
+
+
+@pytest.fixture
+def analyze(cli_env: dict[str, str], event_log: EventLog) -> Callable[..., None]:
+    """Call the session analyze command directly, skipping CliRunner.
+
+    For happy-path tests that only read stdout (via capsys); tests that
+    check exit codes still go through runner.invoke.
+    """
+    obj = {"config": load_config(Path(cli_env["AGENT_MEMORY_PATH"])), "event_log": event_log}
+
+    def run(**params: Any) -> None:
+        with click.Context(session_analyze, obj=obj) as ctx:
+            ctx.invoke(session_analyze, **params)
+
+    return run
+
+
+class StubLLM:
+    """Stand-in for LLMProvider that returns canned patterns."""
+
+    def __init__(self) -> None:
+        self.patterns: list[dict] = []
+
+    def extract_patterns(self, content: str) -> list[dict]:
+        return self.patterns
+
+
+@pytest.fixture
+def mock_llm(monkeypatch: pytest.MonkeyPatch) -> StubLLM:
+    """Install a StubLLM as the provider get_llm_provider returns."""
+    stub = StubLLM()
+    monkeypatch.setattr("agent_memory.llm.get_llm_provider", lambda *args, **kwargs: stub)
+    return stub
+
+
 class TestSessionAnalyze:
     """Tests for session analyze subcommand."""
 
-    def test_analyze_text_dry_run(self, config, temp_dir):
+    def test_analyze_text_dry_run(self, runner, mock_llm, cli_env):
         """Test analyzing inline text with --dry-run."""
-        runner = CliRunner()
-
         mock_patterns = [
             {
                 "error": "TypeError: Cannot read property 'map' of undefined",
@@ -27,30 +71,25 @@ class TestSessionAnalyze:
             }
         ]
 
-        with patch("agent_memory.llm.get_llm_provider") as mock_get_llm:
-            mock_llm = MagicMock(spec=LLMProvider)
-            mock_llm.extract_patterns.return_value = mock_patterns
-            mock_get_llm.return_value = mock_llm
-
-            result = runner.invoke(
-                main,
-                [
-                    "session",
-                    "analyze",
-                    "Hit TypeError in UserList.tsx, null check missing",
-                    "--dry-run",
-                ],
-                env={"AGENT_MEMORY_PATH": str(temp_dir)},
-            )
+        mock_llm.patterns = mock_patterns
+
+        result = runner.invoke(
+            main,
+            [
+                "session",
+                "analyze",
+                "Hit TypeError in UserList.tsx, null check missing",
+                "--dry-run",
+            ],
+            env=cli_env,
+        )
 
         assert result.exit_code == 0
         assert "TypeError" in result.output
         assert "dry run" in result.output
 
-    def test_analyze_text_dry_run_json(self, config, temp_dir):
+    def test_analyze_text_dry_run_json(self, analyze, mock_llm, capsys):
         """Test analyzing with --dry-run and --json."""
-        runner = CliRunner()
-
         mock_patterns = [
             {
                 "error": "ECONNREFUSED",
@@ -60,79 +99,57 @@ class TestSessionAnalyze:
             }
         ]
 
-        with patch("agent_memory.llm.get_llm_provider") as mock_get_llm:
-            mock_llm = MagicMock(spec=LLMProvider)
-            mock_llm.extract_patterns.return_value = mock_patterns
-            mock_get_llm.return_value = mock_llm
-
-            result = runner.invoke(
-                main,
-                [
-                    "session",
-                    "analyze",
-                    "ECONNREFUSED when running tests, fixed by starting Redis",
-                    "--dry-run",
-                    "--json",
-                ],
-                env={"AGENT_MEMORY_PATH": str(temp_dir)},
-            )
+        mock_llm.patterns = mock_patterns
 
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+        analyze(
+            content="ECONNREFUSED when running tests, fixed by starting Redis",
+            dry_run=True,
+            as_json=True,
+        )
+
+        data = json.loads(capsys.readouterr().out)
         assert len(data) == 1
         assert data[0]["error"] == "ECONNREFUSED"
 
-    def test_analyze_no_patterns(self, config, temp_dir):
+    def test_analyze_no_patterns(self, runner, mock_llm, cli_env):
         """Test when no patterns are found."""
-        runner = CliRunner()
-
-        with patch("agent_memory.llm.get_llm_provider") as mock_get_llm:
-            mock_llm = MagicMock(spec=LLMProvider)
-            mock_llm.extract_patterns.return_value = []
-            mock_get_llm.return_value = mock_llm
+        mock_llm.patterns = []
 
-            result = runner.invoke(
-                main,
-                ["session", "analyze", "Everything worked fine", "--dry-run"],
-                env={"AGENT_MEMORY_PATH": str(temp_dir)},
-            )
+        result = runner.invoke(
+            main,
+            ["session", "analyze", "Everything worked fine", "--dry-run"],
+            env=cli_env,
+        )
 
         assert result.exit_code == 0
         assert "No error-fix patterns found" in result.output
 
-    def test_analyze_no_llm(self, config, temp_dir):
+    def test_analyze_no_llm(self, runner, monkeypatch, cli_env):
         """Test graceful failure when LLM is not available."""
-        runner = CliRunner()
-
-        with patch("agent_memory.llm.get_llm_provider") as mock_get_llm:
-            mock_get_llm.return_value = None
+        monkeypatch.setattr("agent_memory.llm.get_llm_provider", lambda *args, **kwargs: None)
 
-            result = runner.invoke(
-                main,
-                ["session", "analyze", "some content"],
-                env={"AGENT_MEMORY_PATH": str(temp_dir)},
-            )
+        result = runner.invoke(
+            main,
+            ["session", "analyze", "some content"],
+            env=cli_env,
+        )
 
         assert result.exit_code != 0
         assert "LLM provider not available" in result.output
 
-    def test_analyze_no_arguments(self, config, temp_dir):
+    def test_analyze_no_arguments(self, runner, cli_env):
         """Test error when no content source is provided."""
-        runner = CliRunner()
-
         result = runner.invoke(
             main,
             ["session", "analyze"],
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
+            env=cli_env,
         )
 
         assert result.exit_code != 0
         assert "Provide content text" in result.output
 
-    def test_analyze_saves_memories(self, config, temp_dir):
+    def test_analyze_saves_memories(self, analyze, mock_llm, monkeypatch, project_path, capsys):
         """Test that analyze saves patterns as memories."""
-        runner = CliRunner()
-
         mock_patterns = [
             {
                 "error": "ImportError: no module named foo",
@@ -142,92 +159,73 @@ class TestSessionAnalyze:
             }
         ]
 
-        project_dir = temp_dir / "test-project"
-        project_dir.mkdir()
-
-        with (
-            patch("agent_memory.llm.get_llm_provider") as mock_get_llm,
-            patch("agent_memory.cli.get_current_project_path", return_value=project_dir),
-        ):
-            mock_llm = MagicMock(spec=LLMProvider)
-            mock_llm.extract_patterns.return_value = mock_patterns
-            mock_get_llm.return_value = mock_llm
-
-            result = runner.invoke(
-                main,
-                [
-                    "session",
-                    "analyze",
-                    "ImportError no module foo, fixed by installing",
-                    "--json",
-                ],
-                env={"AGENT_MEMORY_PATH": str(temp_dir)},
-            )
+        monkeypatch.setattr(
+            "agent_memory.cli.get_current_project_path", lambda *args, **kwargs: project_path
+        )
+        mock_llm.patterns = mock_patterns
 
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+        analyze(content="ImportError no module foo, fixed by installing", as_json=True)
+
+        data = json.loads(capsys.readouterr().out)
         assert len(data) == 1
         assert "memory_id" in data[0]
         assert data[0]["memory_id"].startswith("mem_")
 
 
-class TestExtractPatterns:
-    """Tests for LLMProvider.extract_patterns."""
+RESPONSE_JSON = json.dumps([
+    {
+        "error": "TypeError",
+        "cause": "null ref",
+        "fix": "add null check",
+        "context": "app.ts",
+    }
+])
 
-    def test_extract_patterns_empty_content(self, config):
-        """Test with empty content."""
-        llm = LLMProvider(config)
-        assert llm.extract_patterns("") == []
+RESPONSE_WITH_FENCES = '```json\n[{"error": "E1", "cause": "C1", "fix": "F1", "context": "X"}]\n```'
 
-    def test_extract_patterns_parses_json(self, config):
-        """Test JSON parsing of LLM response."""
-        llm = LLMProvider(config)
 
-        response_json = json.dumps([
-            {
-                "error": "TypeError",
-                "cause": "null ref",
-                "fix": "add null check",
-                "context": "app.ts",
-            }
-        ])
+@pytest.fixture(scope="module")
+def llm(tmp_path_factory: pytest.TempPathFactory) -> LLMProvider:
+    """One LLMProvider using the claude code path, shared by the module.
 
-        with patch.object(llm, "_summarize_claude", return_value=response_json):
-            llm.provider = "claude"
-            result = llm.extract_patterns("some session content")
-
-        assert len(result) == 1
-        assert result[0]["error"] == "TypeError"
+    Tests patch _summarize_claude on it, so no client is ever built.
+    """
+    provider = LLMProvider(load_config(tmp_path_factory.mktemp("llm")))
+    provider.provider = "claude"
+    return provider
 
-    def test_extract_patterns_handles_markdown_fences(self, config):
-        """Test handling of markdown code fences in LLM response."""
-        llm = LLMProvider(config)
 
-        response_with_fences = '```json\n[{"error": "E1", "cause": "C1", "fix": "F1", "context": "X"}]\n```'
-
-        with patch.object(llm, "_summarize_claude", return_value=response_with_fences):
-            llm.provider = "claude"
-            result = llm.extract_patterns("content")
-
-        assert len(result) == 1
-        assert result[0]["error"] == "E1"
+class TestExtractPatterns:
+    """Tests for LLMProvider.extract_patterns."""
 
-    def test_extract_patterns_handles_malformed_json(self, config):
-        """Test graceful handling of malformed JSON."""
-        llm = LLMProvider(config)
+    def test_extract_patterns_empty_content(self, llm: LLMProvider):
+        """Test with empty content."""
+        assert llm.extract_patterns("") == []
 
-        with patch.object(llm, "_summarize_claude", return_value="not valid json at all"):
-            llm.provider = "claude"
-            result = llm.extract_patterns("content")
+    @pytest.mark.parametrize(
+        ("response", "expected_error"),
+        [
+            pytest.param(RESPONSE_JSON, "TypeError", id="json"),
+            pytest.param(RESPONSE_WITH_FENCES, "E1", id="markdown-fences"),
+            pytest.param("not valid json at all", None, id="malformed"),
+        ],
+    )
+    def test_extract_patterns_parses_response(
+        self, llm: LLMProvider, response: str, expected_error: str | None
+    ):
+        """Test parsing of the LLM response, with or without code fences."""
+        with patch.object(llm, "_summarize_claude", return_value=response):
+            result = llm.extract_patterns("some session content")
 
-        assert result == []
+        if expected_error is None:
+            assert result == []
+        else:
+            assert len(result) == 1
+            assert result[0]["error"] == expected_error
 
-    def test_extract_patterns_handles_llm_error(self, config):
+    def test_extract_patterns_handles_llm_error(self, llm: LLMProvider):
         """Test graceful handling of LLM errors."""
-        llm = LLMProvider(config)
-
         with patch.object(llm, "_summarize_claude", side_effect=Exception("API error")):
-            llm.provider = "claude"
             result = llm.extract_patterns("content")
 
         assert result == []
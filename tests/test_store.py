@@ -2,11 +2,42 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Generator
+from datetime import datetime, timezone
+from pathlib import Path
+
 import pytest
 
-from agent_memory.config import Config
+from agent_memory import store as store_module
+from agent_memory.config import Config, load_config
 from agent_memory.store import Memory, MemoryStore
 
+# Read-only corpus shared by the list and search tests
+CORPUS = [
+    {"content": "The API uses JWT tokens", "category": "factual"},
+    {"content": "Database is PostgreSQL", "category": "factual"},
+    {"content": "jwt secrets rotate every hour", "category": "factual", "pinned": True},
+    {"content": "Use poetry to run tests in this project", "category": "decision"},
+    {"content": "The poetry config is in pyproject.toml", "category": "factual"},
+    {"content": "Run pytest for unit tests", "category": "factual", "pinned": True},
+    {"content": "User prefers React components", "category": "decision"},
+]
+
+
+@pytest.fixture(scope="module")
+def populated_store(
+    tmp_path_factory: pytest.TempPathFactory, project_path: Path
+) -> Generator[MemoryStore, None, None]:
+    """Create a store holding CORPUS, built once per module.
+
+    Only for tests that never write; everything else uses ``store``.
+    """
+    store = MemoryStore(load_config(tmp_path_factory.mktemp("populated")), project_path)
+    store.save_many(CORPUS)
+    yield store
+    store.close()
+
 
 class TestMemoryStore:
     """Tests for MemoryStore."""
@@ -58,6 +89,23 @@ class TestMemoryStore:
 
         assert memory.pinned is True
 
+    def test_save_many(self, store: MemoryStore) -> None:
+        """Test saving several memories across databases at once."""
+        memories = store.save_many([
+            {"content": "Project fact", "scope": "project"},
+            {"content": "Global fact", "scope": "global"},
+            {"content": "Team fact", "scope": "group", "groups": ["team"]},
+        ])
+
+        assert [m.content for m in memories] == ["Project fact", "Global fact", "Team fact"]
+        for memory in memories:
+            stored = store.get(memory.id, "global" if memory.scope == "group" else memory.scope)
+            assert stored is not None
+            assert stored.groups == memory.groups
+
+        with pytest.raises(ValueError):
+            store.save_many([{"content": "No groups", "scope": "group"}])
+
     def test_get_memory(self, store: MemoryStore) -> None:
         """Test getting a memory by ID."""
         saved = store.save(content="Test content", scope="project")
@@ -73,105 +121,75 @@ class TestMemoryStore:
         memory = store.get("mem_nonexistent", "project")
         assert memory is None
 
-    def test_list_memories(self, store: MemoryStore) -> None:
+    def test_list_memories(self, populated_store: MemoryStore) -> None:
         """Test listing memories."""
-        store.save(content="Memory 1", scope="project")
-        store.save(content="Memory 2", scope="project")
-        store.save(content="Memory 3", scope="project")
+        memories = populated_store.list("project")
 
-        memories = store.list("project")
+        assert len(memories) == len(CORPUS)
 
-        assert len(memories) == 3
-
-    def test_list_memories_by_category(self, store: MemoryStore) -> None:
+    def test_list_memories_by_category(self, populated_store: MemoryStore) -> None:
         """Test listing memories filtered by category."""
-        store.save(content="Fact 1", category="factual", scope="project")
-        store.save(content="User prefers X", category="decision", scope="project")
-        store.save(content="Fact 2", category="factual", scope="project")
+        factual = populated_store.list("project", category="factual")
+        decisions = populated_store.list("project", category="decision")
 
-        factual = store.list("project", category="factual")
-        decisions = store.list("project", category="decision")
+        assert len(factual) == 5
+        assert len(decisions) == 2
+        assert all(m.category == "decision" for m in decisions)
 
-        assert len(factual) == 2
-        assert len(decisions) == 1
-
-    def test_list_pinned_memories(self, store: MemoryStore) -> None:
+    def test_list_pinned_memories(self, populated_store: MemoryStore) -> None:
         """Test listing only pinned memories."""
-        store.save(content="Normal", scope="project")
-        store.save(content="Pinned 1", pinned=True, scope="project")
-        store.save(content="Pinned 2", pinned=True, scope="project")
-
-        pinned = store.list_pinned("project")
+        pinned = populated_store.list_pinned("project")
 
         assert len(pinned) == 2
         assert all(m.pinned for m in pinned)
 
-    def test_search_keyword(self, store: MemoryStore) -> None:
+    def test_search_keyword(self, populated_store: MemoryStore) -> None:
         """Test keyword search."""
-        store.save(content="The API uses JWT tokens", scope="project")
-        store.save(content="Database is PostgreSQL", scope="project")
-        store.save(content="JWT tokens expire after 1 hour", scope="project")
+        results = populated_store.search_keyword("JWT", "project")
 
-        results = store.search_keyword("JWT", "project")
+        assert {m.content for m in results} == {
+            "The API uses JWT tokens",
+            "jwt secrets rotate every hour",
+        }
 
-        assert len(results) == 2
-        assert all("JWT" in m.content for m in results)
-
-    def test_search_keyword_case_insensitive(self, store: MemoryStore) -> None:
+    @pytest.mark.parametrize("query", ["jwt", "JWT", "Jwt"])
+    def test_search_keyword_case_insensitive(
+        self, populated_store: MemoryStore, query: str
+    ) -> None:
         """Test that keyword search is case-insensitive."""
-        store.save(content="The API uses JWT tokens", scope="project")
-        store.save(content="Database is PostgreSQL", scope="project")
-        store.save(content="jwt tokens expire after 1 hour", scope="project")
-
-        # lowercase query should match uppercase content
-        results = store.search_keyword("jwt", "project")
-        assert len(results) == 2
-
-        # uppercase query should match lowercase content
-        results = store.search_keyword("JWT", "project")
+        # Matches both the uppercase and the lowercase content
+        results = populated_store.search_keyword(query, "project")
         assert len(results) == 2
 
-        # mixed case
-        results = store.search_keyword("Jwt", "project")
-        assert len(results) == 2
-
-    def test_search_keyword_multi_term(self, store: MemoryStore) -> None:
+    def test_search_keyword_multi_term(self, populated_store: MemoryStore) -> None:
         """Test that multi-term queries match all terms independently."""
-        store.save(content="Use poetry to run tests in this project", scope="project")
-        store.save(content="The poetry config is in pyproject.toml", scope="project")
-        store.save(content="Run pytest for unit tests", scope="project")
-
         # Both terms must match
-        results = store.search_keyword("poetry test", "project")
+        results = populated_store.search_keyword("poetry test", "project")
         assert len(results) == 1
         assert "poetry" in results[0].content.lower()
         assert "test" in results[0].content.lower()
 
         # Single term matches more
-        results = store.search_keyword("poetry", "project")
+        results = populated_store.search_keyword("poetry", "project")
         assert len(results) == 2
 
-    def test_search_keyword_or_syntax(self, store: MemoryStore) -> None:
+    def test_search_keyword_or_syntax(self, populated_store: MemoryStore) -> None:
         """Test that OR syntax matches any group."""
-        store.save(content="Authentication uses JWT tokens", scope="project")
-        store.save(content="Database uses PostgreSQL", scope="project")
-        store.save(content="Frontend uses React components", scope="project")
-
         # OR should match either term
-        results = store.search_keyword("JWT OR PostgreSQL", "project")
-        assert len(results) == 2
+        results = populated_store.search_keyword("JWT OR PostgreSQL", "project")
+        assert len(results) == 3
 
         # Single OR with no match on one side
-        results = store.search_keyword("JWT OR nonexistent", "project")
-        assert len(results) == 1
+        results = populated_store.search_keyword("JWT OR nonexistent", "project")
+        assert len(results) == 2
 
         # Mixed AND within OR groups: "JWT tokens OR PostgreSQL"
         # "JWT tokens" = JWT AND tokens, "PostgreSQL" = single term
-        results = store.search_keyword("JWT tokens OR PostgreSQL", "project")
+        results = populated_store.search_keyword("JWT tokens OR PostgreSQL", "project")
         assert len(results) == 2
 
         # AND within OR group that narrows results
-        results = store.search_keyword("JWT nonexistent OR PostgreSQL", "project")
+        results = populated_store.search_keyword("JWT nonexistent OR PostgreSQL", "project")
         assert len(results) == 1
         assert "PostgreSQL" in results[0].content
 
@@ -209,6 +227,21 @@ class TestMemoryStore:
         assert unpinned is not None
         assert unpinned.pinned is False
 
+    def test_pin_by_id(self, store: MemoryStore) -> None:
+        """Test pinning by ID without knowing the memory's scope."""
+        memory = store.save(content="Global pref", scope="global")
+
+        pinned = store.pin_by_id(memory.id)
+        assert pinned is not None
+        assert pinned.pinned is True
+        assert pinned.scope == "global"
+
+        unpinned = store.pin_by_id(memory.id, pinned=False)
+        assert unpinned is not None
+        assert unpinned.pinned is False
+
+        assert store.pin_by_id("mem_nonexistent") is None
+
     def test_delete_memory(self, store: MemoryStore) -> None:
         """Test deleting a memory."""
         memory = store.save(content="To be deleted", scope="project")
@@ -219,6 +252,37 @@ class TestMemoryStore:
         retrieved = store.get(memory.id, "project")
         assert retrieved is None
 
+    def test_get_by_id_across_scopes(self, store: MemoryStore) -> None:
+        """Test get_by_id finds project and global memories and forgets deleted ones."""
+        project_memory = store.save(content="Project fact", scope="project")
+        global_memory = store.save(content="Global fact", scope="global")
+
+        assert store.get_by_id(project_memory.id).scope == "project"
+        assert store.get_by_id(global_memory.id).scope == "global"
+        # Second lookup goes through the remembered database
+        assert store.get_by_id(global_memory.id).scope == "global"
+
+        store.delete(global_memory.id, "global")
+        assert store.get_by_id(global_memory.id) is None
+
+    def test_scope_hints_evict_least_recent(
+        self, store: MemoryStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the scope hint cache drops only its least recently used entry."""
+        hints: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+        monkeypatch.setattr(store_module, "_scope_hints", hints)
+        monkeypatch.setattr(store_module, "SCOPE_HINT_CACHE_SIZE", 2)
+        first, second, third = (
+            store.save(content=f"Global fact {i}", scope="global") for i in range(3)
+        )
+
+        store.get_by_id(first.id)
+        store.get_by_id(second.id)
+        store.get_by_id(first.id)
+        store.get_by_id(third.id)
+
+        assert [key[2] for key in hints] == [first.id, third.id]
+
     def test_delete_nonexistent_memory(self, store: MemoryStore) -> None:
         """Test deleting a nonexistent memory."""
         deleted = store.delete("mem_nonexistent", "project")
@@ -226,9 +290,11 @@ class TestMemoryStore:
 
     def test_delete_matching(self, store: MemoryStore) -> None:
         """Test deleting memories matching a pattern."""
-        store.save(content="Keep this", scope="project")
-        store.save(content="Delete JWT related", scope="project")
-        store.save(content="Also JWT token info", scope="project")
+        store.save_many([
+            {"content": "Keep this", "scope": "project"},
+            {"content": "Delete JWT related", "scope": "project"},
+            {"content": "Also JWT token info", "scope": "project"},
+        ])
 
         count = store.delete_matching("JWT", "project")
 
@@ -239,9 +305,11 @@ class TestMemoryStore:
 
     def test_reset(self, store: MemoryStore) -> None:
         """Test resetting all memories."""
-        store.save(content="Memory 1", scope="project")
-        store.save(content="Memory 2", scope="project")
-        store.save(content="Memory 3", scope="project")
+        store.save_many([
+            {"content": "Memory 1", "scope": "project"},
+            {"content": "Memory 2", "scope": "project"},
+            {"content": "Memory 3", "scope": "project"},
+        ])
 
         count = store.reset("project")
 
@@ -302,6 +370,255 @@ class TestGlobalStore:
         assert len(memories) == 2
 
 
+class TestGroupStore:
+    """Tests for group-scoped listing."""
+
+    def test_list_by_group_query_terms(self, store: MemoryStore) -> None:
+        """Test that query_terms must all match, case-insensitively."""
+        store.save(content="Team uses JWT tokens", scope="group", groups=["team"])
+        store.save(content="JWT secrets live in vault", scope="group", groups=["ops"])
+        store.save(content="Team standup at 10", scope="group", groups=["team"])
+
+        results = store.list_by_group(query_terms=["jwt", "TEAM"])
+        assert [m.content for m in results] == ["Team uses JWT tokens"]
+
+        results = store.list_by_group(group_name="ops", query_terms=["jwt"])
+        assert [m.content for m in results] == ["JWT secrets live in vault"]
+
+    def test_list_by_group_query_terms_are_literal(self, store: MemoryStore) -> None:
+        """Test that LIKE wildcards in query_terms match only themselves."""
+        store.save(content="Coverage is at 50%", scope="group", groups=["team"])
+        store.save(content="Coverage is at 500 lines", scope="group", groups=["team"])
+        store.save(content="Use snake_case names", scope="group", groups=["team"])
+        store.save(content="Use snakeXcase names", scope="group", groups=["team"])
+        store.save(content="Paths like C:\\temp", scope="group", groups=["team"])
+
+        assert [m.content for m in store.list_by_group(query_terms=["50%"])] == [
+            "Coverage is at 50%"
+        ]
+        assert [m.content for m in store.list_by_group(query_terms=["snake_case"])] == [
+            "Use snake_case names"
+        ]
+        assert [m.content for m in store.list_by_group(query_terms=["c:\\"])] == [
+            "Paths like C:\\temp"
+        ]
+
+    def test_list_by_group_query_terms_fold_unicode(self, store: MemoryStore) -> None:
+        """Test that non-ASCII query terms match case-insensitively."""
+        store.save(content="ÉQUIPE meets ÜBER early", scope="group", groups=["team"])
+
+        results = store.list_by_group(query_terms=["équipe", "Über"])
+        assert [m.content for m in results] == ["ÉQUIPE meets ÜBER early"]
+
+    def test_list_by_group_filters_group_before_limit(self, store: MemoryStore) -> None:
+        """Test that group_name is applied before limit, so matches are not lost."""
+        store.save(content="ops note one", scope="group", groups=["ops"])
+        store.save(content="ops note two", scope="group", groups=["ops"])
+        for i in range(3):
+            store.save(content=f"team note {i}", scope="group", groups=["team"])
+
+        results = store.list_by_group(group_name="ops", limit=2, query_terms=["note"])
+        assert sorted(m.content for m in results) == ["ops note one", "ops note two"]
+
+
+class TestIterAllProjects:
+    """Tests for MemoryStore.iter_all_projects()."""
+
+    def test_yields_project_memories(self, config: Config, temp_dir) -> None:
+        """Test memories from every project are yielded and filtered by path."""
+        paths = []
+        for name in ("alpha", "beta"):
+            project_path = temp_dir / name
+            project_path.mkdir()
+            with MemoryStore(config, project_path) as project_store:
+                project_store.save(content=f"{name} JWT fact", scope="project")
+                project_store.save(content="Global fact", scope="global")
+            paths.append(str(project_path.resolve()))
+
+        with MemoryStore(config, None) as store:
+            all_contents = sorted(m.content for _, m in store.iter_all_projects())
+            selected = [
+                (str(p), m.content)
+                for p, m in store.iter_all_projects(query="jwt", project_paths={paths[1]})
+            ]
+
+        assert all_contents == ["alpha JWT fact", "beta JWT fact"]
+        assert selected == [(paths[1], "beta JWT fact")]
+
+
+class TestKeywordMatching:
+    """Tests that every keyword search path folds case and escapes terms alike."""
+
+    CONTENTS = [
+        "ÉQUIPE hit 50% coverage",
+        "equipe hit 500 lines",
+        "Use snake_case",
+        "Use snakeXcase",
+    ]
+
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            pytest.param("équipe", ["ÉQUIPE hit 50% coverage"], id="unicode-case"),
+            pytest.param("50%", ["ÉQUIPE hit 50% coverage"], id="percent-literal"),
+            pytest.param("snake_case", ["Use snake_case"], id="underscore-literal"),
+        ],
+    )
+    def test_same_matches_in_every_scope(
+        self, config: Config, temp_dir: Path, query: str, expected: list[str]
+    ) -> None:
+        """Test project, global, group and cross-project searches agree."""
+        project_path = temp_dir / "project"
+        project_path.mkdir()
+        with MemoryStore(config, project_path) as store:
+            for content in self.CONTENTS:
+                store.save(content=content, scope="project")
+                store.save(content=content, scope="global")
+                store.save(content=content, scope="group", groups=["team"])
+
+            def contents(memories: list[Memory]) -> list[str]:
+                # The global DB also holds the group copies, so compare distinct contents
+                return sorted({m.content for m in memories})
+
+            assert contents(store.search_keyword(query, "project")) == expected
+            assert contents(store.search_keyword(query, "global")) == expected
+            assert contents(store.list_by_group(query_terms=[query])) == expected
+            assert contents([m for _, m in store.iter_all_projects(query=query)]) == expected
+
+            assert store.delete_matching(query, "project") == len(expected)
+
+
+class TestCategoryHistogram:
+    """Tests for MemoryStore.category_histogram()."""
+
+    def test_counts_by_scope_and_category(self, store: MemoryStore) -> None:
+        """Test counts are grouped across project and global databases."""
+        store.save(content="Fact 1", category="factual", scope="project")
+        store.save(content="Fact 2", category="factual", scope="project")
+        store.save(content="User prefers X", category="decision", scope="global")
+        store.save(content="Team fact", category="factual", scope="group", groups=["team"])
+
+        histogram = store.category_histogram()
+
+        assert histogram == {
+            ("project", "factual"): 2,
+            ("global", "decision"): 1,
+            ("group", "factual"): 1,
+        }
+
+    def test_ignores_legacy_group_rows_in_project_db(self, store: MemoryStore) -> None:
+        """Test group-scoped rows left in a project DB are not counted."""
+        legacy = store.save(content="Old shared fact", category="factual", scope="project")
+        conn = store._get_conn("project")
+        conn.execute("UPDATE memories SET scope = 'group' WHERE id = ?", (legacy.id,))
+        conn.commit()
+        store.save(content="Fact", category="factual", scope="project")
+
+        assert store.category_histogram() == {("project", "factual"): 1}
+
+    def test_excludes_expired(self, store: MemoryStore) -> None:
+        """Test expired memories are only counted when requested."""
+        store.save(
+            content="Old fact",
+            category="factual",
+            scope="project",
+            expires_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        )
+
+        assert store.category_histogram() == {}
+        assert store.category_histogram(include_expired=True) == {("project", "factual"): 1}
+
+
+class TestUsageSnapshot:
+    """Tests for MemoryStore.usage_snapshot()."""
+
+    def test_totals_and_lists(self, store: MemoryStore) -> None:
+        """Test totals, most-accessed and pin candidates across scopes."""
+        hot = store.save(content="Hot fact", category="factual", scope="project")
+        store.save(content="Cold fact", category="factual", scope="project")
+        store.save(content="Global pref", category="decision", scope="global")
+        store.record_access_batch([hot.id] * 5)
+
+        snapshot = store.usage_snapshot(("project", "global"), pin_min_access=5)
+
+        assert snapshot["totals"] == {"project": (2, 1), "global": (1, 1)}
+        assert [m.content for m in snapshot["most_accessed"]] == ["Hot fact"]
+        assert [m.content for m in snapshot["pin_candidates"]] == ["Hot fact"]
+
+    def test_skips_unreadable_scope(self, config: Config, temp_dir: Path) -> None:
+        """Test that a corrupt project database is skipped, not raised."""
+        project = temp_dir / "broken-project"
+        project.mkdir()
+        with MemoryStore(config, project) as store:
+            store.save(content="Global pref", category="decision", scope="global")
+            assert store.project_db_path is not None
+            store.project_db_path.parent.mkdir(parents=True, exist_ok=True)
+            store.project_db_path.write_bytes(b"not a sqlite database" * 100)
+
+            snapshot = store.usage_snapshot(("project", "global"))
+
+        assert snapshot["totals"] == {"global": (1, 1)}
+
+    def test_inside_open_transaction(self, store: MemoryStore) -> None:
+        """Test that an already open transaction is reused and left open."""
+        store.save(content="Global pref", category="decision", scope="global")
+        conn = store._get_conn("global")
+        conn.execute("BEGIN DEFERRED")
+        try:
+            snapshot = store.usage_snapshot(("global",))
+            assert conn.in_transaction
+        finally:
+            conn.commit()
+
+        assert snapshot["totals"] == {"global": (1, 1)}
+
+
+class TestAccessStats:
+    """Tests for MemoryStore.access_stats()."""
+
+    def test_counts(self, store: MemoryStore) -> None:
+        """Test total, never-accessed and stale counts for a scope."""
+        hot = store.save(content="Hot fact", scope="project")
+        store.save(content="Fresh fact", scope="project")
+        store.save(content="Pinned fact", scope="project", pinned=True)
+        store.record_access_batch([hot.id])
+
+        assert store.access_stats("project") == (3, 2, 0)
+        assert store.access_stats("project", stale_days=0) == (3, 2, 1)
+        assert store.access_stats("global") == (0, 0, 0)
+
+
+class TestVersionToken:
+    """Tests for MemoryStore.version_token()."""
+
+    def test_changes_on_write(self, store: MemoryStore) -> None:
+        """Test the token is stable between writes and changes after each one."""
+        initial = store.version_token()
+        assert store.version_token() == initial
+
+        memory = store.save(content="Fact", category="factual", scope="project")
+        after_save = store.version_token()
+        assert after_save != initial
+
+        store.record_access_batch([memory.id])
+        after_access = store.version_token()
+        assert after_access != after_save
+
+        store.delete(memory.id, "project")
+        assert store.version_token() not in (after_save, after_access)
+
+    def test_scoped_to_selected_databases(self, store: MemoryStore) -> None:
+        """Test that a token only changes for writes to the databases it covers."""
+        store.save(content="Project fact", category="factual", scope="project")
+        global_only = store.version_token(include_projects=False)
+
+        store.save(content="Another project fact", category="factual", scope="project")
+        assert store.version_token(include_projects=False) == global_only
+
+        store.save(content="Global fact", category="factual", scope="global")
+        assert store.version_token(include_projects=False) != global_only
+
+
 class TestMetadata:
     """Tests for metadata support."""
 
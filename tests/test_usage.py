@@ -2,20 +2,74 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
 
+import click
+import orjson
+import pytest
 from click.testing import CliRunner
 
-from agent_memory.cli import main
+from agent_memory.cli import main, usage
+from agent_memory.config import load_config
+from agent_memory.event_log import EventLog
+
+
+@pytest.fixture
+def empty_dir(tmp_path: Path) -> Path:
+    """Fresh base path with no memories.
+
+    Per test, since the usage command itself writes the event log and
+    config into its base path.
+    """
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def memory_path_env(monkeypatch: pytest.MonkeyPatch, empty_dir: Path) -> None:
+    """Point the CLI at empty_dir unless a test passes its own env."""
+    monkeypatch.setenv("AGENT_MEMORY_PATH", str(empty_dir))
+
+
+@pytest.fixture(scope="class")
+def populated_dir(runner: CliRunner, tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Base path with two memories saved through the CLI, shared by a class.
+
+    The tests using it only read usage stats, so the saves run once.
+    """
+    base_path = tmp_path_factory.mktemp("usage")
+    env = {"AGENT_MEMORY_PATH": str(base_path)}
+    for content in ("Memory one", "Memory two"):
+        result = runner.invoke(main, ["save", content], env=env)
+        assert result.exit_code == 0, result.output
+    return base_path
+
+
+@pytest.fixture
+def usage_json(capsys: pytest.CaptureFixture[str]) -> Callable[..., dict[str, Any]]:
+    """Call the usage command directly with --json and return the parsed report.
+
+    Skips CliRunner for tests that only inspect the report; the Click
+    wiring is still covered by the tests that go through runner.invoke.
+    """
+
+    def run(base_path: Path, since: str = "30d") -> dict[str, Any]:
+        config = load_config(base_path)
+        with EventLog(config) as event_log:
+            with click.Context(usage, obj={"config": config, "event_log": event_log}) as ctx:
+                ctx.invoke(usage, since=since, as_json=True)
+        return orjson.loads(capsys.readouterr().out)
+
+    return run
 
 
 class TestUsageCommand:
     """Tests for the 'usage' command."""
 
-    def test_usage_default(self, temp_dir) -> None:
+    def test_usage_default(self, runner) -> None:
         """Test usage command with defaults."""
-        runner = CliRunner()
-        result = runner.invoke(main, ["usage"], env={"AGENT_MEMORY_PATH": str(temp_dir)})
+        result = runner.invoke(main, ["usage"])
         assert result.exit_code == 0
         assert "Usage Report" in result.output
         assert "Command Frequency" in result.output
@@ -23,14 +77,9 @@ class TestUsageCommand:
         assert "Memory Effectiveness" in result.output
         assert "Agent Compliance" in result.output
 
-    def test_usage_json(self, temp_dir) -> None:
+    def test_usage_json(self, usage_json, empty_dir) -> None:
         """Test usage command with --json output."""
-        runner = CliRunner()
-        result = runner.invoke(
-            main, ["usage", "--json"], env={"AGENT_MEMORY_PATH": str(temp_dir)}
-        )
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+        data = usage_json(empty_dir)
         assert "period_days" in data
         assert data["period_days"] == 30
         assert "command_frequency" in data
@@ -39,99 +88,49 @@ class TestUsageCommand:
         assert "memory_effectiveness" in data
         assert "recommendations" in data
 
-    def test_usage_since_7d(self, temp_dir) -> None:
-        """Test usage command with --since 7d."""
-        runner = CliRunner()
-        result = runner.invoke(
-            main, ["usage", "--since", "7d"], env={"AGENT_MEMORY_PATH": str(temp_dir)}
-        )
-        assert result.exit_code == 0
-        assert "last 7d" in result.output
-
-    def test_usage_since_90d(self, temp_dir) -> None:
-        """Test usage command with --since 90d."""
-        runner = CliRunner()
-        result = runner.invoke(
-            main, ["usage", "--since", "90d"], env={"AGENT_MEMORY_PATH": str(temp_dir)}
-        )
-        assert result.exit_code == 0
-        assert "last 90d" in result.output
-
-    def test_usage_invalid_since(self, temp_dir) -> None:
-        """Test usage command with invalid --since."""
-        runner = CliRunner()
-        result = runner.invoke(
-            main, ["usage", "--since", "7w"], env={"AGENT_MEMORY_PATH": str(temp_dir)}
-        )
-        assert result.exit_code != 0
-
-    def test_usage_json_period_days(self, temp_dir) -> None:
-        """Test JSON output reflects --since parameter."""
-        runner = CliRunner()
-        result = runner.invoke(
-            main,
-            ["usage", "--since", "7d", "--json"],
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
-        )
-        assert result.exit_code == 0
-        data = json.loads(result.output)
-        assert data["period_days"] == 7
-
-    def test_usage_with_some_data(self, temp_dir) -> None:
+    @pytest.mark.parametrize(
+        ("args", "exit_code", "fragment", "period_days"),
+        [
+            pytest.param(["--since", "7d"], 0, "last 7d", None, id="since-7d"),
+            pytest.param(["--since", "90d"], 0, "last 90d", None, id="since-90d"),
+            pytest.param(["--since", "7w"], 1, None, None, id="invalid-since"),
+            pytest.param(["--since", "7d", "--json"], 0, None, 7, id="json-period-days"),
+        ],
+    )
+    def test_usage_since(
+        self,
+        runner,
+        args: list[str],
+        exit_code: int,
+        fragment: str | None,
+        period_days: int | None,
+    ) -> None:
+        """Test that --since is validated and reflected in the report."""
+        result = runner.invoke(main, ["usage", *args])
+        assert result.exit_code == exit_code
+        if fragment is not None:
+            assert fragment in result.output
+        if period_days is not None:
+            assert orjson.loads(result.output)["period_days"] == period_days
+
+    def test_usage_with_some_data(self, usage_json, populated_dir) -> None:
         """Test usage command after some commands have been run."""
-        runner = CliRunner()
-
-        # Save a memory first
-        runner.invoke(
-            main,
-            ["save", "Test memory for usage tracking"],
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
-        )
-
-        # Now check usage
-        result = runner.invoke(
-            main, ["usage", "--json"], env={"AGENT_MEMORY_PATH": str(temp_dir)}
-        )
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+        data = usage_json(populated_dir)
 
         # Should have at least one save event
         freq = data["command_frequency"]
         assert freq.get("save", 0) >= 1
 
-    def test_usage_memory_effectiveness(self, temp_dir) -> None:
+    def test_usage_memory_effectiveness(self, usage_json, populated_dir) -> None:
         """Test memory effectiveness section in JSON output."""
-        runner = CliRunner()
-
-        # Save a couple of memories
-        runner.invoke(
-            main,
-            ["save", "Memory one"],
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
-        )
-        runner.invoke(
-            main,
-            ["save", "Memory two"],
-            env={"AGENT_MEMORY_PATH": str(temp_dir)},
-        )
-
-        result = runner.invoke(
-            main, ["usage", "--json"], env={"AGENT_MEMORY_PATH": str(temp_dir)}
-        )
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+        data = usage_json(populated_dir)
 
         mem_eff = data["memory_effectiveness"]
         assert mem_eff["total_memories"] >= 2
         assert "never_accessed" in mem_eff
         assert "never_accessed_pct" in mem_eff
 
-    def test_usage_recommendations_in_json(self, temp_dir) -> None:
+    def test_usage_recommendations_in_json(self, usage_json, empty_dir) -> None:
         """Test recommendations section in JSON output."""
-        runner = CliRunner()
-        result = runner.invoke(
-            main, ["usage", "--json"], env={"AGENT_MEMORY_PATH": str(temp_dir)}
-        )
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+        data = usage_json(empty_dir)
         assert isinstance(data["recommendations"], list)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 import pytest
 
@@ -20,6 +20,12 @@ from agent_memory.utils import (
     truncate_text,
 )
 
+JAN_1_2024 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+JAN_15_2024_1030 = datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
+JAN_31_2024 = datetime(2024, 1, 31, tzinfo=timezone.utc)
+PAST = datetime(2020, 1, 1, tzinfo=timezone.utc)
+FUTURE = datetime(2999, 1, 1, tzinfo=timezone.utc)
+
 
 class TestGenerateIds:
     """Tests for ID generation."""
@@ -56,9 +62,7 @@ class TestTimestamp:
 
     def test_format_timestamp(self) -> None:
         """Test timestamp formatting."""
-        ts = datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
-
-        formatted = format_timestamp(ts)
+        formatted = format_timestamp(JAN_15_2024_1030)
 
         assert "2024-01-15" in formatted
         assert "10:30:00" in formatted
@@ -68,32 +72,30 @@ class TestTimestamp:
 class TestCategoryDetection:
     """Tests for category detection."""
 
-    def test_detect_decision_category(self) -> None:
-        """Test detection of decision category."""
-        assert detect_category("User prefers functional components") == "decision"
-        assert detect_category("We chose to use Redux") == "decision"
-        assert detect_category("Rejected the class-based approach") == "decision"
-        assert detect_category("Always use type hints") == "decision"
-        assert detect_category("Never use var in TypeScript") == "decision"
-
-    def test_detect_task_history_category(self) -> None:
-        """Test detection of task history category."""
-        assert detect_category("Implemented the login feature") == "task_history"
-        assert detect_category("Fixed the authentication bug") == "task_history"
-        assert detect_category("Added new API endpoint") == "task_history"
-        assert detect_category("Refactored the user module") == "task_history"
-
-    def test_detect_session_summary_category(self) -> None:
-        """Test detection of session summary category."""
-        assert detect_category("Session summary: worked on auth") == "session_summary"
-        assert detect_category("Today we discussed the API design") == "session_summary"
-        assert detect_category("In this session we covered testing") == "session_summary"
-
-    def test_detect_factual_category(self) -> None:
-        """Test detection of factual category (default)."""
-        assert detect_category("The API uses REST") == "factual"
-        assert detect_category("Database is PostgreSQL") == "factual"
-        assert detect_category("Port 8080 is used for the server") == "factual"
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("User prefers functional components", "decision"),
+            ("We chose to use Redux", "decision"),
+            ("Rejected the class-based approach", "decision"),
+            ("Always use type hints", "decision"),
+            ("Never use var in TypeScript", "decision"),
+            ("Implemented the login feature", "task_history"),
+            ("Fixed the authentication bug", "task_history"),
+            ("Added new API endpoint", "task_history"),
+            ("Refactored the user module", "task_history"),
+            ("Session summary: worked on auth", "session_summary"),
+            ("Today we discussed the API design", "session_summary"),
+            ("In this session we covered testing", "session_summary"),
+            # No keywords: defaults to factual
+            ("The API uses REST", "factual"),
+            ("Database is PostgreSQL", "factual"),
+            ("Port 8080 is used for the server", "factual"),
+        ],
+    )
+    def test_detect_category(self, text: str, expected: str) -> None:
+        """Test auto-detection of each category from content."""
+        assert detect_category(text) == expected
 
     def test_is_valid_category(self) -> None:
         """Test category validation."""
@@ -153,29 +155,25 @@ class TestExpiration:
 
     def test_calculate_expiration_with_days(self) -> None:
         """Test calculating expiration date."""
-        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        expires = calculate_expiration(created, 30)
-
-        assert expires is not None
-        assert expires == datetime(2024, 1, 31, tzinfo=timezone.utc)
+        assert calculate_expiration(JAN_1_2024, 30) == JAN_31_2024
 
     def test_calculate_expiration_none(self) -> None:
         """Test calculating expiration with no days (never expires)."""
-        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
-        expires = calculate_expiration(created, None)
-
-        assert expires is None
-
-    def test_is_expired_past(self) -> None:
-        """Test checking if a past date is expired."""
-        past = datetime(2020, 1, 1, tzinfo=timezone.utc)
-        assert is_expired(past) is True
-
-    def test_is_expired_future(self) -> None:
-        """Test checking if a future date is expired."""
-        future = get_timestamp() + timedelta(days=30)
-        assert is_expired(future) is False
-
-    def test_is_expired_none(self) -> None:
-        """Test checking if None (never expires) is expired."""
-        assert is_expired(None) is False
+        assert calculate_expiration(JAN_1_2024, None) is None
+
+    @pytest.mark.parametrize(
+        ("expires_at", "expected"),
+        [
+            pytest.param(PAST, True, id="past"),
+            pytest.param(FUTURE, False, id="future"),
+            pytest.param(None, False, id="never-expires"),
+        ],
+    )
+    def test_is_expired(self, expires_at: datetime | None, expected: bool) -> None:
+        """Test checking whether an expiration date has passed."""
+        assert is_expired(expires_at) is expected
+
+    def test_is_expired_at_given_now(self) -> None:
+        """Test that an explicit now replaces the current time."""
+        assert is_expired(JAN_1_2024, now=JAN_31_2024) is True
+        assert is_expired(JAN_31_2024, now=JAN_1_2024) is False
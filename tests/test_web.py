@@ -0,0 +1,199 @@
+"""Tests for the Flask web API."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import orjson
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from agent_memory.config import Config
+from agent_memory.groups import GroupManager
+from agent_memory.store import MemoryStore
+from agent_memory.web import COMPRESS_MIN_SIZE, create_app
+
+
+@pytest.fixture
+def app(config: Config, project_path: Path) -> Flask:
+    """App backed by the per-test config."""
+    return create_app(config, project_path)
+
+
+@pytest.fixture
+def client(app: Flask) -> FlaskClient:
+    """Test client for the app."""
+    return app.test_client()
+
+
+class TestConditionalGet:
+    """Tests for ETag / 304 handling on the polled endpoints."""
+
+    @pytest.mark.parametrize(
+        "url", ["/api/memories", "/api/stats", "/api/projects", "/api/groups"]
+    )
+    def test_not_modified_when_etag_matches(self, client: FlaskClient, url: str) -> None:
+        """Test that a matching If-None-Match gets a 304 with no body."""
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        second = client.get(url, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.data == b""
+        assert second.headers["ETag"] == etag
+
+    def test_etag_changes_after_write(self, client: FlaskClient) -> None:
+        """Test that saving a memory invalidates the previous ETag."""
+        etag = client.get("/api/stats").headers["ETag"]
+
+        created = client.post("/api/memories", json={"content": "New memory"})
+        assert created.status_code == 201
+
+        response = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_etag_covers_only_databases_read(self, client: FlaskClient) -> None:
+        """Test that a project write leaves the global listing's ETag valid."""
+        url = "/api/memories?scope=global"
+        etag = client.get(url).headers["ETag"]
+
+        client.post("/api/memories", json={"content": "Project memory"})
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        client.post("/api/memories", json={"content": "Global memory", "scope": "global"})
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_groups_etag_changes_with_groups_file(
+        self, client: FlaskClient, config: Config
+    ) -> None:
+        """Test that editing groups.yaml invalidates the /api/groups ETag."""
+        etag = client.get("/api/groups").headers["ETag"]
+
+        GroupManager(config).create("team")
+
+        response = client.get("/api/groups", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert [g["name"] for g in response.json] == ["team"]
+
+    def test_detail_endpoint_has_no_etag(self, client: FlaskClient) -> None:
+        """Test that single-memory lookups skip the ETag scan."""
+        memory_id = client.post("/api/memories", json={"content": "Detail"}).json["id"]
+
+        response = client.get(f"/api/memories/{memory_id}")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+
+class TestCompression:
+    """Tests for gzip encoding of JSON responses."""
+
+    @pytest.fixture
+    def large_memory_id(self, client: FlaskClient) -> str:
+        """Id of a memory whose JSON is well over COMPRESS_MIN_SIZE."""
+        response = client.post("/api/memories", json={"content": "x" * (2 * COMPRESS_MIN_SIZE)})
+        return response.json["id"]
+
+    def test_large_body_is_gzipped(self, client: FlaskClient, large_memory_id: str) -> None:
+        """Test that bodies above COMPRESS_MIN_SIZE are gzip-encoded."""
+        url = f"/api/memories/{large_memory_id}"
+        plain = client.get(url).data
+
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.vary
+        assert gzip.decompress(response.data) == plain
+
+    def test_small_body_is_not_gzipped(self, client: FlaskClient) -> None:
+        """Test that bodies below COMPRESS_MIN_SIZE are sent as-is."""
+        response = client.get("/api/projects", headers={"Accept-Encoding": "gzip"})
+        assert len(response.data) < COMPRESS_MIN_SIZE
+        assert "Content-Encoding" not in response.headers
+
+    def test_not_gzipped_without_accept_encoding(
+        self, client: FlaskClient, large_memory_id: str
+    ) -> None:
+        """Test that clients not accepting gzip get an uncompressed body."""
+        response = client.get(f"/api/memories/{large_memory_id}")
+        assert "Content-Encoding" not in response.headers
+        assert "Accept-Encoding" in response.vary
+        assert response.json["id"] == large_memory_id
+
+    def test_gzipped_response_has_weak_etag(
+        self, client: FlaskClient, large_memory_id: str
+    ) -> None:
+        """Test that the ETag on a gzipped polled response is weak."""
+        response = client.get("/api/memories", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"].startswith('W/"')
+
+
+class TestErrors:
+    """Tests for API error responses."""
+
+    def test_malformed_int_arg_returns_400(self, client: FlaskClient) -> None:
+        """Test that a malformed query parameter gets a JSON 400."""
+        response = client.get("/api/memories?limit=abc")
+        assert response.status_code == 400
+        assert response.is_json
+        assert response.json == {"error": "limit must be an integer"}
+
+    def test_invalid_scope_returns_400(self, client: FlaskClient) -> None:
+        """Test that a store rejecting client input gets a JSON 400."""
+        memory_id = client.post("/api/memories", json={"content": "Scoped"}).json["id"]
+
+        response = client.put(f"/api/memories/{memory_id}/scope", json={"scope": "bogus"})
+        assert response.status_code == 400
+        assert response.json == {"error": "Invalid scope: bogus"}
+
+    def test_missing_groups_returns_400(self, client: FlaskClient) -> None:
+        """Test that a malformed groups list is rejected before reaching the store."""
+        memory_id = client.post("/api/memories", json={"content": "Grouped"}).json["id"]
+
+        response = client.post(f"/api/memories/{memory_id}/groups", json={"groups": "team"})
+        assert response.status_code == 400
+        assert response.json == {"error": "groups list is required"}
+
+    def test_invalid_operation_returns_400(self, client: FlaskClient) -> None:
+        """Test that an operation the memory's state rules out gets a JSON 400."""
+        memory_id = client.post("/api/memories", json={"content": "Project only"}).json["id"]
+
+        response = client.post(f"/api/memories/{memory_id}/groups", json={"groups": ["team"]})
+        assert response.status_code == 400
+        assert response.json == {"error": "Can only add groups to group-scoped memories"}
+
+    def test_internal_value_error_returns_500(
+        self, client: FlaskClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a ValueError outside argument parsing is a server error."""
+
+        def fail(self: MemoryStore, memory_id: str) -> None:
+            raise ValueError("No project path set")
+
+        monkeypatch.setattr(MemoryStore, "get_by_id", fail)
+        response = client.get("/api/memories/mem_x")
+        assert response.status_code == 500
+        assert b"No project path set" not in response.data
+
+
+class TestJSONProvider:
+    """Tests for the orjson-backed JSON provider."""
+
+    def test_responses_are_json_with_sorted_keys(self, client: FlaskClient) -> None:
+        """Test that API responses are application/json with sorted keys."""
+        response = client.get("/api/stats")
+        assert response.mimetype == "application/json"
+
+        keys = list(orjson.loads(response.data))
+        assert keys == sorted(keys)
+
+    def test_non_string_keys(self, app: Flask) -> None:
+        """Test that dicts with non-string keys serialize (OPT_NON_STR_KEYS)."""
+        with app.app_context():
+            response = app.json.response({2: "b", 1: "a"})
+
+        assert response.mimetype == "application/json"
+        assert orjson.loads(response.data) == {"1": "a", "2": "b"}